@@ -1,56 +1,124 @@
+import hashlib
+import hmac
+import secrets
 import sqlite3
-from . import db, security
+import time
+from . import db, security, tasks
+
+SESSION_TTL_SECONDS = 7 * 24 * 3600  # remember-me tokens expire after a week
+
+# SQL kept as module constants so each connection's statement cache reuses them
+INSERT_USER = "INSERT INTO users (email, password, first_name, last_name) VALUES (?, ?, ?, ?)"
+INSERT_STATS = "INSERT INTO stats (user_id) VALUES (?)"
+SELECT_LOGIN = "SELECT id, password FROM users WHERE email=?"
+SELECT_USER = "SELECT email, first_name, last_name FROM users WHERE id=?"
+UPDATE_USER = "UPDATE users SET first_name=?, last_name=? WHERE id=?"
+DELETE_STATS = "DELETE FROM stats WHERE user_id=?"
+DELETE_GAME_SESSIONS = "DELETE FROM game_sessions WHERE user_id=?"
+DELETE_USER = "DELETE FROM users WHERE id=?"
+# answers go, the anonymous per-question totals in reflection_question_stats stay
+DELETE_REFLECTION_ANSWERS = "DELETE FROM reflection_answers WHERE attempt_id IN (SELECT id FROM reflection_attempts WHERE user_id=?)"
+DELETE_REFLECTION_ATTEMPTS = "DELETE FROM reflection_attempts WHERE user_id=?"
+UPDATE_PASSWORD = "UPDATE users SET password=? WHERE id=?"
+INSERT_SESSION = "INSERT INTO login_sessions (selector, verifier_hash, user_id, expires_at) VALUES (?, ?, ?, ?)"
+SELECT_SESSION = "SELECT user_id, verifier_hash, expires_at FROM login_sessions WHERE selector=?"
+DELETE_SESSION = "DELETE FROM login_sessions WHERE selector=?"
+DELETE_USER_SESSIONS = "DELETE FROM login_sessions WHERE user_id=?"
+DELETE_EXPIRED_SESSIONS = "DELETE FROM login_sessions WHERE expires_at < ?"
 
 def signup(email, password, first_name="", last_name=""):
-    conn = sqlite3.connect(db.DB_NAME)
-    cursor = conn.cursor()
+    # hash before opening the transaction so the write lock isn't held during argon2
+    hashed = security.hash_password(password)
     try:
-        hashed = security.hash_password(password)
-        cursor.execute(
-            "INSERT INTO users (email, password, first_name, last_name) VALUES (?, ?, ?, ?)",
-            (email, hashed, first_name, last_name)
-        )
-        user_id = cursor.lastrowid
-        cursor.execute("INSERT INTO stats (user_id) VALUES (?)", (user_id,))
-        conn.commit()
+        with db.transaction() as cursor:
+            cursor.execute(INSERT_USER, (email, hashed, first_name, last_name))
+            cursor.execute(INSERT_STATS, (cursor.lastrowid,))
         return True
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
 def login(email, password):
-    conn = sqlite3.connect(db.DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, password FROM users WHERE email=?", (email,))
-    row = cursor.fetchone()
-    conn.close()
+    row = db.get_connection().execute(SELECT_LOGIN, (email,)).fetchone()
     if not row:
         return None
     user_id, stored_hash = row
-    if security.verify_password(password, stored_hash):
-        return (user_id,)
-    return None
+    ok, new_hash = security.verify_and_update(password, stored_hash)
+    if not ok:
+        return None
+    if new_hash:
+        # argon2 settings changed since this hash was made: upgrade it now that we have the password
+        with db.transaction() as cursor:
+            cursor.execute(UPDATE_PASSWORD, (new_hash, user_id))
+    return (user_id,)
+
+def login_remembered(email, password):
+    # login() plus a remember-me token: (user_id, token) or None
+    user = login(email, password)
+    if not user:
+        return None
+    return user[0], create_session(user[0])
+
+# Remember-me sessions. A token is "<selector>.<verifier>": the selector finds the
+# row through its unique index, the verifier is checked against a stored sha256
+# in constant time. No argon2 here: tokens are random, not guessable passwords.
+def _verifier_hash(verifier):
+    return hashlib.sha256(verifier.encode()).hexdigest()
+
+def create_session(user_id, ttl=SESSION_TTL_SECONDS):
+    selector = secrets.token_urlsafe(12)
+    verifier = secrets.token_urlsafe(32)
+    now = time.time()
+    with db.transaction() as cursor:
+        cursor.execute(DELETE_EXPIRED_SESSIONS, (now,))
+        cursor.execute(INSERT_SESSION, (selector, _verifier_hash(verifier), user_id, now + ttl))
+    return f"{selector}.{verifier}"
+
+def resume_session(token):
+    # (user_id,) for a valid, unexpired token, else None
+    selector, _, verifier = (token or "").partition(".")
+    if not selector or not verifier:
+        return None
+    row = db.get_connection().execute(SELECT_SESSION, (selector,)).fetchone()
+    if not row:
+        return None
+    user_id, verifier_hash, expires_at = row
+    if not hmac.compare_digest(verifier_hash, _verifier_hash(verifier)):
+        return None
+    if expires_at < time.time():
+        revoke_session(token)
+        return None
+    return (user_id,)
+
+def revoke_session(token):
+    selector = (token or "").partition(".")[0]
+    with db.transaction() as cursor:
+        cursor.execute(DELETE_SESSION, (selector,))
+
+def revoke_user_sessions(user_id):
+    with db.transaction() as cursor:
+        cursor.execute(DELETE_USER_SESSIONS, (user_id,))
 
 def get_user(user_id):
-    conn = sqlite3.connect(db.DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT email, first_name, last_name FROM users WHERE id=?", (user_id,))
-    user = cursor.fetchone()
-    conn.close()
-    return user
+    return db.get_connection().execute(SELECT_USER, (user_id,)).fetchone()
 
 def update_user(user_id, first_name, last_name):
-    conn = sqlite3.connect(db.DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("UPDATE users SET first_name=?, last_name=? WHERE id=?", (first_name, last_name, user_id))
-    conn.commit()
-    conn.close()
+    with db.transaction() as cursor:
+        cursor.execute(UPDATE_USER, (first_name, last_name, user_id))
 
 def delete_user(user_id):
-    conn = sqlite3.connect(db.DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM stats WHERE user_id=?", (user_id,))
-    cursor.execute("DELETE FROM users WHERE id=?", (user_id,))
-    conn.commit()
-    conn.close()
+    with db.transaction() as cursor:
+        cursor.execute(DELETE_USER_SESSIONS, (user_id,))
+        cursor.execute(DELETE_GAME_SESSIONS, (user_id,))
+        cursor.execute(DELETE_REFLECTION_ANSWERS, (user_id,))
+        cursor.execute(DELETE_REFLECTION_ATTEMPTS, (user_id,))
+        cursor.execute(DELETE_STATS, (user_id,))
+        cursor.execute(DELETE_USER, (user_id,))
+
+# Non-blocking versions for the UI: argon2 runs on a worker thread and
+# callback(future) is delivered on the UI thread (see tasks.set_dispatcher).
+def signup_async(email, password, first_name="", last_name="", callback=None):
+    return tasks.submit(signup, email, password, first_name, last_name, callback=callback)
+
+def login_async(email, password, remember=False, callback=None):
+    # the future's result is login()'s, or login_remembered()'s when remember is set
+    return tasks.submit(login_remembered if remember else login, email, password, callback=callback)
@@ -1,26 +1,181 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
 
 DB_NAME = "arete.db"
 
-def init_db():
-    conn = sqlite3.connect(DB_NAME)
+# Applied once per connection. WAL lets readers run while a write commits and
+# makes commits much cheaper than the default rollback journal.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # safe with WAL, skips an fsync per commit
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",  # wait on a locked db instead of failing straight away
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",  # ~8 MB page cache
+)
+
+# sqlite3 keeps compiled statements per connection, keyed by SQL text, so the
+# module-level query strings in auth are prepared once and reused.
+STATEMENT_CACHE_SIZE = 128
+
+# One persistent connection per thread (sqlite3 connections shouldn't be shared
+# between threads mid-transaction); all of them are tracked for close_all().
+_local = threading.local()
+_lock = threading.Lock()
+_connections = []
+_generation = 0  # bumped by close_all() so every thread reconnects
+_initialized = set()  # database files whose schema has been created in this process
+
+
+def _connect(db_name):
+    conn = sqlite3.connect(
+        db_name,
+        isolation_level=None,  # autocommit; transaction() issues BEGIN/COMMIT itself
+        check_same_thread=False,  # only so close_all() can close other threads' connections
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_connection():
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.db_name != DB_NAME or _local.generation != _generation:
+        conn = _connect(DB_NAME)
+        _local.conn = conn
+        _local.db_name = DB_NAME
+        with _lock:
+            _local.generation = _generation
+            _connections.append(conn)
+        # the first connection to a database creates the tables, so no startup step
+        # has to run init_db() before the first query (CREATE ... IF NOT EXISTS is idempotent)
+        if DB_NAME not in _initialized:
+            init_db()
+            _initialized.add(DB_NAME)
+    return conn
+
+
+@contextmanager
+def transaction():
+    # with db.transaction() as cursor: ...  -> commits on success, rolls back on error.
+    # A nested transaction() joins the outer one.
+    conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            first_name TEXT,
-            last_name TEXT
-        )
-    """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS stats (
-            user_id INTEGER,
-            high_score INTEGER DEFAULT 0,
-            games_played INTEGER DEFAULT 0,
-            FOREIGN KEY(user_id) REFERENCES users(id)
-        )
-    """)
-    conn.commit()
-    conn.close()
+    if conn.in_transaction:
+        yield cursor
+        return
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        yield cursor
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+def close_all():
+    global _generation
+    with _lock:
+        for conn in _connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _connections.clear()
+        _generation += 1
+
+
+def init_db():
+    with transaction() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                email TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL,
+                first_name TEXT,
+                last_name TEXT
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stats (
+                user_id INTEGER,
+                high_score INTEGER DEFAULT 0,
+                games_played INTEGER DEFAULT 0,
+                FOREIGN KEY(user_id) REFERENCES users(id)
+            )
+        """)
+        # one row per finished game; stats is kept up to date from these at insert time
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS game_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                distance INTEGER NOT NULL,
+                avoided INTEGER NOT NULL,
+                played_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_id) REFERENCES users(id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_game_sessions_user_score ON game_sessions(user_id, score)")
+        # stats lookups by user and the leaderboard are index seeks instead of scans
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_stats_user ON stats(user_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_stats_high_score ON stats(high_score)")
+        # remember-me logins: the token is "<selector>.<verifier>"; only a sha256 of the
+        # verifier is stored, and rows are looked up by the unique selector
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS login_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                selector TEXT UNIQUE NOT NULL,
+                verifier_hash TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                expires_at REAL NOT NULL,
+                FOREIGN KEY(user_id) REFERENCES users(id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_login_sessions_user ON login_sessions(user_id)")
+        # reflection quiz (see arete/reflection.py); choices is a JSON list of strings
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reflection_questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                position INTEGER NOT NULL DEFAULT 0,
+                text TEXT NOT NULL,
+                choices TEXT NOT NULL,
+                correct INTEGER NOT NULL,
+                active INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reflection_attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                correct INTEGER NOT NULL,
+                completed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_id) REFERENCES users(id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reflection_attempts_user ON reflection_attempts(user_id)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reflection_answers (
+                attempt_id INTEGER NOT NULL,
+                question_id INTEGER NOT NULL,
+                choice INTEGER NOT NULL,
+                correct INTEGER NOT NULL,
+                PRIMARY KEY(attempt_id, question_id),
+                FOREIGN KEY(attempt_id) REFERENCES reflection_attempts(id),
+                FOREIGN KEY(question_id) REFERENCES reflection_questions(id)
+            ) WITHOUT ROWID
+        """)
+        # running totals per question, updated in the same transaction as the answers
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reflection_question_stats (
+                question_id INTEGER PRIMARY KEY,
+                answered INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY(question_id) REFERENCES reflection_questions(id)
+            )
+        """)
@@ -0,0 +1,153 @@
+# Bulk account provisioning for a whole class: streams a CSV of users
+# (header: email,password[,first_name,last_name]), hashes the passwords with
+# argon2 across a process pool and inserts users + their stats rows with
+# executemany, one transaction per chunk. Rows that can't be created (missing
+# fields, an email already taken or repeated in the file) are reported with
+# their line number and skipped; the rest of the file still goes in.
+#
+#   python -m arete.provision cohort.csv [--processes 8] [--chunk 256]
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from . import db, security
+
+CHUNK_SIZE = 256  # rows per hash batch and per transaction
+MAX_SQL_VARIABLES = 500  # below SQLite's limit of host parameters per statement
+
+INSERT_USER = "INSERT INTO users (email, password, first_name, last_name) VALUES (?, ?, ?, ?)"
+INSERT_STATS_FOR_EMAIL = "INSERT INTO stats (user_id) SELECT id FROM users WHERE email=?"
+SELECT_EXISTING_EMAILS = "SELECT email FROM users WHERE email IN ({})"
+
+
+def _init_worker(settings):
+    security.apply_settings(settings)
+
+
+def _hash(password):
+    return security.hash_password(password)
+
+
+def read_users(f):
+    # yields (line number, email, password, first_name, last_name) per CSV row
+    reader = csv.DictReader(f)
+    missing = {"email", "password"} - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+    for row in reader:
+        yield (reader.line_num, (row.get("email") or "").strip(), row.get("password") or "",
+               (row.get("first_name") or "").strip(), (row.get("last_name") or "").strip())
+
+
+def _existing_emails(emails):
+    taken = set()
+    conn = db.get_connection()
+    for start in range(0, len(emails), MAX_SQL_VARIABLES):
+        batch = emails[start:start + MAX_SQL_VARIABLES]
+        sql = SELECT_EXISTING_EMAILS.format(",".join("?" * len(batch)))
+        taken.update(row[0] for row in conn.execute(sql, batch))
+    return taken
+
+
+def _insert_chunk(rows, errors):
+    # rows: (line, email, hashed, first_name, last_name). If another writer took an
+    # email since the duplicate check, redo the chunk row by row to find it.
+    users = [(email, hashed, first, last) for _, email, hashed, first, last in rows]
+    try:
+        with db.transaction() as cursor:
+            cursor.executemany(INSERT_USER, users)
+            cursor.executemany(INSERT_STATS_FOR_EMAIL, [(user[0],) for user in users])
+        return len(rows)
+    except sqlite3.IntegrityError:
+        pass
+    created = 0
+    with db.transaction() as cursor:
+        for line, email, hashed, first, last in rows:
+            try:
+                cursor.execute("SAVEPOINT provision_row")
+                cursor.execute(INSERT_USER, (email, hashed, first, last))
+                cursor.execute(INSERT_STATS_FOR_EMAIL, (email,))
+                cursor.execute("RELEASE provision_row")
+                created += 1
+            except sqlite3.IntegrityError:
+                cursor.execute("ROLLBACK TO provision_row")
+                cursor.execute("RELEASE provision_row")
+                errors.append((line, email, "email already in use"))
+    return created
+
+
+def provision(f, processes=None, chunk_size=CHUNK_SIZE, progress=None):
+    # f: open text file with the CSV. Returns (created count, errors) where errors
+    # is a list of (line, email, reason). progress(created, errors) after each chunk.
+    created = 0
+    errors = []
+    seen = set()
+    rows = read_users(f)
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(security.get_settings(),)) as pool:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            first_error = len(errors)
+            # cheap checks first, so rejected rows never reach argon2
+            valid = []
+            for line, email, password, first, last in chunk:
+                if not email or not password:
+                    errors.append((line, email, "missing email or password"))
+                elif email in seen:
+                    errors.append((line, email, "duplicate email in file"))
+                else:
+                    seen.add(email)
+                    valid.append((line, email, password, first, last))
+            taken = _existing_emails([row[1] for row in valid])
+            if taken:
+                errors.extend((row[0], row[1], "email already in use") for row in valid if row[1] in taken)
+                valid = [row for row in valid if row[1] not in taken]
+
+            hashes = pool.map(_hash, [row[2] for row in valid],
+                              chunksize=max(1, len(valid) // (workers * 4)))
+            rows_to_insert = [(line, email, hashed, first, last)
+                              for (line, email, _, first, last), hashed in zip(valid, hashes)]
+            created += _insert_chunk(rows_to_insert, errors)
+            errors[first_error:] = sorted(errors[first_error:])
+            if progress is not None:
+                progress(created, errors)
+    return created, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create accounts in bulk from a CSV "
+                                                 "(email,password[,first_name,last_name]).")
+    parser.add_argument("csv_path")
+    parser.add_argument("--db", default=db.DB_NAME, help="database file (default: %(default)s)")
+    parser.add_argument("--processes", type=int, default=None, help="hashing processes (default: all cores)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="rows per transaction")
+    args = parser.parse_args(argv)
+
+    db.DB_NAME = args.db
+    t0 = time.perf_counter()
+    reported = 0
+
+    def progress(created, errors):
+        nonlocal reported
+        for line, email, reason in errors[reported:]:
+            print(f"line {line}: {email or '(no email)'}: {reason}", file=sys.stderr)
+        reported = len(errors)
+        print(f"{created} accounts created", end="\r", flush=True)
+
+    with open(args.csv_path, newline="", encoding="utf-8") as f:
+        created, errors = provision(f, args.processes, args.chunk, progress)
+    db.close_all()
+    print(f"{created} accounts created, {len(errors)} rows skipped in {time.perf_counter() - t0:.1f}s")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+import json
+import threading
+
+from . import db, tasks
+
+# The reflection quiz shown after a game. Questions live in reflection_questions
+# (seeded with DEFAULT_QUESTIONS the first time the table is empty); each finished
+# quiz is one attempt row plus one answer row per question, written in a single
+# transaction together with the per-question counters in reflection_question_stats,
+# so the aggregates are read directly instead of being recomputed from the answers.
+DEFAULT_QUESTIONS = [
+    {"text": "How many clusters off purple seaweed were in the background?", "choices": ["2", "3", "1", "4"], "correct": 3},
+    {"text": "What color was the seashell in the sea background?", "choices": ["Blue", "Red", "Purple", "Green"], "correct": 2},
+    {"text": "How many sea rocks were in the background?", "choices": ["1", "2", "3", "4"], "correct": 1},
+    {"text": "How many red flowers were in the forest background?", "choices": ["2", "3", "1", "4"], "correct": 1},
+    {"text": "What color was the other flower in the forest background?", "choices": ["Blue", "Red", "Purple", "Green"], "correct": 0},
+    {"text": "In the space background how many planets were there?", "choices": ["1", "2", "3", "4"], "correct": 1},
+    {"text": "What color was the spaceship in the space background?", "choices": ["Blue", "Red", "White", "Green"], "correct": 2},
+]
+
+COUNT_QUESTIONS = "SELECT COUNT(*) FROM reflection_questions"
+INSERT_QUESTION = "INSERT INTO reflection_questions (position, text, choices, correct) VALUES (?, ?, ?, ?)"
+SELECT_QUESTIONS = "SELECT id, text, choices, correct FROM reflection_questions WHERE active=1 ORDER BY position, id"
+INSERT_ATTEMPT = "INSERT INTO reflection_attempts (user_id, total, correct) VALUES (?, ?, ?)"
+INSERT_ANSWER = "INSERT INTO reflection_answers (attempt_id, question_id, choice, correct) VALUES (?, ?, ?, ?)"
+UPSERT_QUESTION_STATS = """
+    INSERT INTO reflection_question_stats (question_id, answered, correct) VALUES (?, 1, ?)
+    ON CONFLICT(question_id) DO UPDATE SET
+        answered = answered + 1,
+        correct = correct + excluded.correct
+"""
+SELECT_QUESTION_STATS = """
+    SELECT q.id, q.text, COALESCE(s.answered, 0), COALESCE(s.correct, 0)
+    FROM reflection_questions q LEFT JOIN reflection_question_stats s ON s.question_id = q.id
+    WHERE q.active=1 ORDER BY q.position, q.id
+"""
+SELECT_ATTEMPTS = """
+    SELECT total, correct, completed_at FROM reflection_attempts
+    WHERE user_id=? ORDER BY id DESC LIMIT ?
+"""
+
+# the question bank only changes through the database, so it's read once per process
+_questions = None
+_lock = threading.Lock()
+
+
+def seed_questions(questions=DEFAULT_QUESTIONS):
+    with db.transaction() as cursor:
+        if cursor.execute(COUNT_QUESTIONS).fetchone()[0]:
+            return 0
+        cursor.executemany(INSERT_QUESTION, [(i, q["text"], json.dumps(q["choices"]), q["correct"])
+                                             for i, q in enumerate(questions)])
+    return len(questions)
+
+
+def get_questions():
+    # [{"id", "text", "choices", "correct"}] in quiz order
+    global _questions
+    with _lock:
+        if _questions is None:
+            seed_questions()
+            rows = db.get_connection().execute(SELECT_QUESTIONS).fetchall()
+            _questions = [{"id": qid, "text": text, "choices": json.loads(choices), "correct": correct}
+                          for qid, text, choices, correct in rows]
+        return _questions
+
+
+def reload_questions():
+    global _questions
+    with _lock:
+        _questions = None
+    return get_questions()
+
+
+def save_attempt(user_id, answers):
+    # answers: [(question_id, choice index)]. Correctness is checked here against
+    # the question bank, not trusted from the caller. Returns (correct, total).
+    correct_by_id = {q["id"]: q["correct"] for q in get_questions()}
+    graded = [(question_id, choice, int(correct_by_id.get(question_id) == choice))
+              for question_id, choice in answers]
+    score = sum(ok for _, _, ok in graded)
+    with db.transaction() as cursor:
+        cursor.execute(INSERT_ATTEMPT, (user_id, len(graded), score))
+        attempt_id = cursor.lastrowid
+        cursor.executemany(INSERT_ANSWER, [(attempt_id, qid, choice, ok) for qid, choice, ok in graded])
+        cursor.executemany(UPSERT_QUESTION_STATS, [(qid, ok) for qid, _, ok in graded])
+    return score, len(graded)
+
+
+def save_attempt_async(user_id, answers, callback=None):
+    return tasks.submit(save_attempt, user_id, list(answers), callback=callback)
+
+
+def question_stats():
+    # [(question_id, text, answered, correct)] for the dashboard: one row per question
+    return db.get_connection().execute(SELECT_QUESTION_STATS).fetchall()
+
+
+def recent_attempts(user_id, limit=10):
+    return db.get_connection().execute(SELECT_ATTEMPTS, (user_id, limit)).fetchall()
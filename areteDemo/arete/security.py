@@ -1,22 +1,93 @@
-from passlib.context import CryptContext
+import os
+import threading
 
-# CryptContext centralizes hashing config 
-pwd_context = CryptContext(
-    schemes=["argon2"],
-    default="argon2",
-    deprecated="auto",
+# CryptContext centralizes hashing config. passlib + the argon2 backend take a
+# while to import, so the context is created on first use (or by warm_up() on a
+# background thread at startup) instead of when this module is imported.
+_context = None
+_context_lock = threading.Lock()
+_settings = {}
+
+
+def get_context():
+    global _context
+    if _context is None:
+        with _context_lock:
+            if _context is None:
+                from passlib.context import CryptContext
+                _context = CryptContext(
+                    schemes=["argon2"],
+                    default="argon2",
+                    deprecated="auto",
+                    **_settings,
+                )
+    return _context
+
+
+def warm_up():
+    # load passlib and the argon2 backend and run one hash, so the first real login doesn't pay for it
+    get_context().hash("warm-up")
+
+
+# argon2 cost parameters; passlib's defaults are used for any left as None.
+# Can be set from the environment (ARETE_ARGON2_TIME_COST, ..._MEMORY_COST in KiB,
+# ..._PARALLELISM) or with configure(), e.g. to benchmark latency vs cost.
+def configure(time_cost=None, memory_cost=None, parallelism=None):
+    settings = {
+        "argon2__time_cost": time_cost,
+        "argon2__memory_cost": memory_cost,
+        "argon2__parallelism": parallelism,
+    }
+    apply_settings({key: value for key, value in settings.items() if value is not None})
+
+
+def apply_settings(settings):
+    # passlib-style settings ({"argon2__time_cost": 3, ...}), as returned by get_settings()
+    _settings.update(settings)
+    if settings and _context is not None:
+        _context.update(**settings)
+
+
+def get_settings():
+    # the cost settings applied so far, e.g. to configure worker processes the same way
+    return dict(_settings)
+
+
+def _env_int(name):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+configure(
+    time_cost=_env_int("ARETE_ARGON2_TIME_COST"),
+    memory_cost=_env_int("ARETE_ARGON2_MEMORY_COST"),
+    parallelism=_env_int("ARETE_ARGON2_PARALLELISM"),
 )
 
 
 # Password hashing and verification functions
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_context().hash(password)
+
+
+# Verification that also reports whether the stored hash should be replaced:
+# passlib's needs_update() flags hashes made with older cost settings, and
+# new_hash is then a fresh hash of the same password with the current ones.
+def verify_and_update(plain_password: str, hashed_password: str):
+    try:
+        return get_context().verify_and_update(plain_password, hashed_password)  # (ok, new_hash or None)
+    except Exception:
+        return False, None
+
+
+def needs_update(hashed_password: str) -> bool:
+    return get_context().needs_update(hashed_password)
 
 
 # Password verification for plain vs hashed passwords
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
-        return pwd_context.verify(plain_password, hashed_password) #checks if plain password matches hashed password
+        return get_context().verify(plain_password, hashed_password) #checks if plain password matches hashed password
     except Exception:
         
         return False   #in case of any error during verification, return False
@@ -0,0 +1,76 @@
+import sqlite3
+import threading
+
+from . import db, tasks
+
+INSERT_SESSION = "INSERT INTO game_sessions (user_id, score, distance, avoided) VALUES (?, ?, ?, ?)"
+# accounts created before the stats row existed get one on their first game
+ENSURE_STATS = "INSERT INTO stats (user_id) SELECT ? WHERE NOT EXISTS (SELECT 1 FROM stats WHERE user_id=?)"
+UPDATE_STATS = "UPDATE stats SET games_played = games_played + 1, high_score = MAX(high_score, ?) WHERE user_id=?"
+SELECT_STATS = "SELECT high_score, games_played FROM stats WHERE user_id=?"
+SELECT_LEADERBOARD = """
+    SELECT users.first_name, users.last_name, users.email, stats.high_score
+    FROM stats JOIN users ON users.id = stats.user_id
+    WHERE stats.high_score > 0
+    ORDER BY stats.high_score DESC
+    LIMIT ?
+"""
+SELECT_BEST_SESSIONS = """
+    SELECT score, distance, avoided, played_at FROM game_sessions
+    WHERE user_id=? ORDER BY score DESC LIMIT ?
+"""
+
+
+# Buffers finished games on the UI thread (just a list append) and writes them
+# in one background transaction on flush(): session rows plus the running
+# high_score/games_played in stats. If the database can't be written (locked
+# past busy_timeout, schema missing: sqlite3.OperationalError) the rows go back
+# into the buffer and the next flush() retries them.
+class SessionRecorder:
+    def __init__(self):
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def record(self, user_id, score, distance, avoided):
+        with self._lock:
+            self._buffer.append((user_id, score, distance, avoided))
+
+    def flush(self, callback=None):
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return None
+        return tasks.submit(self._write, rows, callback=callback)
+
+    def _write(self, rows):
+        try:
+            return write_sessions(rows)
+        except sqlite3.OperationalError:
+            # back into the buffer, ahead of anything recorded since, before the future fails
+            with self._lock:
+                self._buffer[:0] = rows
+            raise
+
+def write_sessions(rows):
+    with db.transaction() as cursor:
+        cursor.executemany(INSERT_SESSION, rows)
+        cursor.executemany(ENSURE_STATS, [(user_id, user_id) for user_id, *_ in rows])
+        cursor.executemany(UPDATE_STATS, [(score, user_id) for user_id, score, *_ in rows])
+    return len(rows)
+
+
+def get_stats(user_id):
+    # (high_score, games_played)
+    row = db.get_connection().execute(SELECT_STATS, (user_id,)).fetchone()
+    return row or (0, 0)
+
+
+def leaderboard(limit=10):
+    return db.get_connection().execute(SELECT_LEADERBOARD, (limit,)).fetchall()
+
+
+def best_sessions(user_id, limit=5):
+    return db.get_connection().execute(SELECT_BEST_SESSIONS, (user_id, limit)).fetchall()
+
+
+recorder = SessionRecorder()
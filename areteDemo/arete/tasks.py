@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Background work for the UI (password hashing, db writes). Results are handed
+# back through the dispatcher; main.py installs one that goes through Kivy's
+# Clock.schedule_once so callbacks run on the UI thread. Without one, callbacks
+# run on the worker thread.
+MAX_WORKERS = 2
+
+_executor = None
+_dispatch = None
+
+
+def set_dispatcher(dispatch):
+    # dispatch(fn) must arrange for fn() to be called on the UI thread
+    global _dispatch
+    _dispatch = dispatch
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="arete-task")
+    return _executor
+
+
+def submit(fn, *args, callback=None, **kwargs):
+    # Run fn(*args, **kwargs) in the background. Returns a Future; callback(future)
+    # is delivered through the dispatcher once it finishes.
+    future = _get_executor().submit(fn, *args, **kwargs)
+    if callback is not None:
+        def done(f):
+            if _dispatch is None:
+                callback(f)
+            else:
+                _dispatch(lambda: callback(f))
+        future.add_done_callback(done)
+    return future
+
+
+def shutdown(wait=True):
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
@@ -0,0 +1,53 @@
+# Steady-state allocation check for the simulation: plays a full session
+# headless (heuristic player) and, after a warm-up, reports how many obstacle
+# slots were created, how the number of gc-tracked objects and allocated memory
+# blocks changed, and how many gc collections ran, under each ARETE_GC mode.
+# Run from the areteDemo folder:  python -m benchmarks.bench_alloc [seconds]
+import gc
+import sys
+
+from game.constants import GAME_DURATION
+from game.gc_policy import GC_MODES, GcMonitor, GcPolicy
+from game.headless import heuristic_policy
+from game.simulation import GameSimulation
+
+WARMUP_SECONDS = 30.0
+
+
+def run(mode, duration):
+    sim = GameSimulation(seed=1, duration=duration)
+    while sim.elapsed < WARMUP_SECONDS:
+        sim.step(jump=heuristic_policy(sim))
+
+    policy = GcPolicy(mode)
+    policy.begin_play()
+    monitor = GcMonitor()
+    slots = sim.obstacles.slots.created
+    objects = len(gc.get_objects())
+    blocks = sys.getallocatedblocks()
+    while not sim.game_over:
+        sim.step(jump=heuristic_policy(sim))
+    result = {
+        "slots": sim.obstacles.slots.created - slots,
+        "objects": len(gc.get_objects()) - objects,
+        "blocks": sys.getallocatedblocks() - blocks,
+        "collections": list(monitor.collections),
+        "pause": monitor.max_pause_ms,
+    }
+    monitor.close()
+    policy.end_play()
+    return result
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else GAME_DURATION
+    print(f"{duration - WARMUP_SECONDS:.0f}s of play after a {WARMUP_SECONDS:.0f}s warm-up")
+    print(f"{'gc mode':<8} {'new slots':>9} {'+gc objects':>11} {'+blocks':>8} {'gen0/1/2 collections':>21} {'max pause ms':>13}")
+    for mode in GC_MODES:
+        r = run(mode, duration)
+        gens = "/".join(str(n) for n in r["collections"])
+        print(f"{mode:<8} {r['slots']:>9} {r['objects']:>11} {r['blocks']:>8} {gens:>21} {r['pause']:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# Latency of arete.security hash/verify across argon2 cost settings, to pick
+# values for ARETE_ARGON2_TIME_COST / _MEMORY_COST / _PARALLELISM.
+# Run from the areteDemo folder:  python -m benchmarks.bench_argon2 [repeats]
+import statistics
+import sys
+import time
+
+from arete import security
+
+TIME_COSTS = (1, 2, 3, 4)
+MEMORY_COSTS = (19456, 47104, 65536, 102400)  # KiB
+PARALLELISM = (1, 4)
+
+
+def median_ms(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'time':>5} {'memory KiB':>11} {'lanes':>6} {'hash ms':>9} {'verify ms':>10}")
+    for parallelism in PARALLELISM:
+        for memory_cost in MEMORY_COSTS:
+            for time_cost in TIME_COSTS:
+                security.configure(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+                hashed = security.hash_password("correct horse battery staple")
+                hash_ms = median_ms(lambda: security.hash_password("correct horse battery staple"), repeats)
+                verify_ms = median_ms(lambda: security.verify_password("correct horse battery staple", hashed), repeats)
+                print(f"{time_cost:>5} {memory_cost:>11} {parallelism:>6} {hash_ms:>9.1f} {verify_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Texture load times: decoding the PNGs vs the prebuilt textures from
+# game/asset_pipeline.py (run that first).
+#   cold start   - AssetCache.load(): obstacle sprites + all five backgrounds
+#   theme switch - decode + upload of one background, per theme
+# Run from the areteDemo folder:  python -m benchmarks.bench_assets [repeats]
+#
+# Files are read through the OS cache after the first repeat, so on a machine
+# with a slow disk the first cold-start number is the one to look at.
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+from kivy.core.window import Window  # noqa: F401  (creates the GL context for textures)
+
+from game.assets import AssetCache, BACKGROUND_IMAGES, load_manifest
+
+
+def timed_ms(fn):
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def cold_start(packed, height):
+    cache = AssetCache(packed=packed)
+    cache.set_target_height(height)
+    return timed_ms(cache.load)
+
+
+def theme_switch(packed, height):
+    cache = AssetCache(packed=packed)
+    cache.set_target_height(height)
+    return [timed_ms(lambda: cache.decode_background(cache.background_key(theme)).texture)
+            for theme in range(len(BACKGROUND_IMAGES))]
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    manifest = load_manifest()
+    if manifest is None:
+        print("no prebuilt textures; run  python -m game.asset_pipeline  first")
+        return
+    print(f"{'source':<8} {'height':>6} {'cold start ms':>14} {'first':>8} {'switch ms':>10} {'max':>8}")
+    rows = [(False, None)] + [(True, height) for height in manifest["heights"]]
+    for packed, height in rows:
+        starts = [cold_start(packed, height) for _ in range(repeats)]
+        switches = [ms for _ in range(repeats) for ms in theme_switch(packed, height)]
+        label = "prebuilt" if packed else "png"
+        print(f"{label:<8} {height or 1080:>6} {statistics.median(starts):>14.1f} {starts[0]:>8.1f} "
+              f"{statistics.median(switches):>10.1f} {max(switches):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
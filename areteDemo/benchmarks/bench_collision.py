@@ -0,0 +1,94 @@
+# Microbenchmark of the per-frame obstacle work (move, collide, expire) at
+# 10/100/1000 live obstacles: the old list-copy/full-scan/list.remove loop over
+# Obstacle objects vs GameSimulation's ObstacleStore (one scroll offset, sorted
+# slots with x-window culling).
+# Run from the areteDemo folder:  python -m benchmarks.bench_collision [frames]
+import sys
+import time
+
+from game.constants import WINDOW_WIDTH, FLOOR_HEIGHT, SIM_DT
+from game.obstacles import ObstacleStore
+from game.simulation import GameSimulation
+
+SPEED = 240
+
+
+# the old per-instance obstacle
+class Obstacle:
+    def __init__(self, x, y, size, theme):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.theme = theme
+        self.passed = False
+
+
+# the loop GameWidget.update ran before the simulation core
+def legacy_frame(sim, dt):
+    for ob in list(sim.obstacles):
+        ob.x -= sim.speed * dt
+    cx, cy, r = sim.player_x, sim.player_y, sim.player_radius
+    for ob in list(sim.obstacles):
+        nearest_x = max(ob.x, min(cx, ob.x + ob.size))
+        nearest_y = max(ob.y, min(cy, ob.y + ob.size))
+        dx = cx - nearest_x
+        dy = cy - nearest_y
+        if (dx*dx + dy*dy) <= r * r:
+            sim.obstacles.remove(ob)
+            break
+    for ob in list(sim.obstacles):
+        if not ob.passed and (ob.x + ob.size) < 0:
+            ob.passed = True
+            sim.avoided_count += 1
+            sim.obstacles.remove(ob)
+
+
+def store_frame(sim, dt):
+    sim.obstacles.scroll(sim.speed * dt)
+    sim._collide()
+    sim._expire_passed()
+
+
+def fill(sim, n, legacy):
+    span = WINDOW_WIDTH + 200
+    if legacy:
+        sim.obstacles = [Obstacle(-100 + i * span / n, FLOOR_HEIGHT, 80, 0) for i in range(n)]
+    else:
+        sim.obstacles = ObstacleStore()
+        for i in range(n):
+            sim.obstacles.spawn(-100 + i * span / n, FLOOR_HEIGHT, 80, 0)
+    # keep the player in the air so nothing is removed by hits and n stays put
+    sim.player_y = FLOOR_HEIGHT + 400
+
+
+def refill(sim, n, legacy):
+    # respawn whatever expired so the live count stays at n
+    while len(sim.obstacles) < n:
+        if legacy:
+            sim.obstacles.append(Obstacle(WINDOW_WIDTH + 100, FLOOR_HEIGHT, 80, 0))
+        else:
+            sim.obstacles.spawn(WINDOW_WIDTH + 100, FLOOR_HEIGHT, 80, 0)
+
+
+def bench(frame, n, frames, legacy):
+    sim = GameSimulation(seed=1)
+    sim.speed = SPEED
+    fill(sim, n, legacy)
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        frame(sim, SIM_DT)
+        refill(sim, n, legacy)
+    return (time.perf_counter() - t0) / frames * 1e6
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'live':>6} {'legacy us/frame':>16} {'store us/frame':>16} {'speedup':>8}")
+    for n in (10, 100, 1000):
+        old = bench(legacy_frame, n, frames, True)
+        new = bench(store_frame, n, frames, False)
+        print(f"{n:>6} {old:>16.1f} {new:>16.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# ops/sec of the arete.auth database calls: the old connect-per-call code vs the
+# pooled WAL connection in arete.db. argon2 is swapped for a constant hash so
+# only the database side is measured.
+# Run from the areteDemo folder:  python -m benchmarks.bench_db [ops] [folder]
+# Point the folder at the networked home directory to see the connect cost there.
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from arete import auth, db, security
+
+FAKE_HASH = "$argon2id$v=19$m=65536,t=3,p=4$benchmark"
+
+
+# --- the pre-pool versions of the auth calls ---
+def legacy_signup(email, password, first_name="", last_name=""):
+    conn = sqlite3.connect(db.DB_NAME)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "INSERT INTO users (email, password, first_name, last_name) VALUES (?, ?, ?, ?)",
+            (email, FAKE_HASH, first_name, last_name)
+        )
+        cursor.execute("INSERT INTO stats (user_id) VALUES (?)", (cursor.lastrowid,))
+        conn.commit()
+        return True
+    except sqlite3.IntegrityError:
+        return False
+    finally:
+        conn.close()
+
+
+def legacy_get_user(user_id):
+    conn = sqlite3.connect(db.DB_NAME)
+    cursor = conn.cursor()
+    cursor.execute("SELECT email, first_name, last_name FROM users WHERE id=?", (user_id,))
+    user = cursor.fetchone()
+    conn.close()
+    return user
+
+
+def legacy_update_user(user_id, first_name, last_name):
+    conn = sqlite3.connect(db.DB_NAME)
+    cursor = conn.cursor()
+    cursor.execute("UPDATE users SET first_name=?, last_name=? WHERE id=?", (first_name, last_name, user_id))
+    conn.commit()
+    conn.close()
+
+
+def timed(label, fn, ops):
+    t0 = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    rate = ops / (time.perf_counter() - t0)
+    print(f"  {label:<12} {rate:>10,.0f} ops/s")
+    return rate
+
+
+def run(prefix, signup, get_user, update_user, ops):
+    print(prefix)
+    timed("signup", lambda i: signup(f"{prefix}{i}@example.com", "pw", "A", "B"), ops)
+    ids = [row[0] for row in sqlite3.connect(db.DB_NAME).execute(
+        "SELECT id FROM users WHERE email LIKE ?", (prefix + "%",))]
+    timed("get_user", lambda i: get_user(ids[i % len(ids)]), ops)
+    timed("update_user", lambda i: update_user(ids[i % len(ids)], "C", str(i)), ops)
+
+
+def main():
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    folder = sys.argv[2] if len(sys.argv) > 2 else tempfile.mkdtemp()
+    security.hash_password = lambda password: FAKE_HASH
+
+    # separate files: journal_mode=WAL sticks to a database file once set
+    db.DB_NAME = os.path.join(folder, "bench_before.db")
+    conn = sqlite3.connect(db.DB_NAME)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, email TEXT UNIQUE NOT NULL,"
+                 " password TEXT NOT NULL, first_name TEXT, last_name TEXT)")
+    conn.execute("CREATE TABLE stats (user_id INTEGER, high_score INTEGER DEFAULT 0,"
+                 " games_played INTEGER DEFAULT 0, FOREIGN KEY(user_id) REFERENCES users(id))")
+    conn.close()
+    run("before", legacy_signup, legacy_get_user, legacy_update_user, ops)
+
+    db.DB_NAME = os.path.join(folder, "bench_after.db")
+    db.init_db()
+    run("after", auth.signup, auth.get_user, auth.update_user, ops)
+    db.close_all()
+
+
+if __name__ == "__main__":
+    main()
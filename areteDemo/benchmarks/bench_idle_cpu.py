@@ -0,0 +1,57 @@
+# CPU use of the game window while it sits idle on the "Press SPACE" prompt:
+# the event-driven loop (nothing scheduled) vs the old always-on 60 Hz update.
+# Needs a display. Run from the areteDemo folder:
+#   python -m benchmarks.bench_idle_cpu [seconds]
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+from kivy.app import App
+from kivy.clock import Clock
+
+from capstone_game_demo_kivy import GameWidget
+
+WARMUP_SECONDS = 1.0
+
+
+class IdleCpuApp(App):
+    def __init__(self, seconds, **kwargs):
+        super().__init__(**kwargs)
+        self.seconds = seconds
+        self.results = []
+
+    def build(self):
+        self.game = GameWidget()
+        return self.game
+
+    def on_start(self):
+        Clock.schedule_once(lambda dt: self._measure("event-driven", self._always_on), WARMUP_SECONDS)
+
+    def _measure(self, label, then):
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+
+        def done(dt):
+            cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+            self.results.append((label, 100.0 * cpu / wall))
+            then()
+        Clock.schedule_once(done, self.seconds)
+
+    def _always_on(self):
+        # what GameWidget.__init__ used to do: keep update scheduled for good
+        self._loop = Clock.schedule_interval(self.game.update, 1.0 / 60)
+        Clock.schedule_once(lambda dt: self._measure("always-on 60 Hz", self.stop), WARMUP_SECONDS)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    app = IdleCpuApp(seconds)
+    app.run()
+    print(f"idle CPU over {seconds:.0f} s (percent of one core)")
+    for label, percent in app.results:
+        print(f"  {label:<16} {percent:6.1f} %")
+
+
+if __name__ == "__main__":
+    main()
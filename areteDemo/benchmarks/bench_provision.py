@@ -0,0 +1,46 @@
+# Bulk account creation: arete.provision (process-pool argon2, chunked
+# executemany) vs calling auth.signup once per user. Uses the real argon2
+# settings, so the signup loop is only run on a sample and extrapolated.
+# Run from the areteDemo folder:
+#   python -m benchmarks.bench_provision [users] [loop sample] [processes]
+import io
+import os
+import sys
+import tempfile
+import time
+
+from arete import auth, db, provision
+
+
+def make_csv(count, prefix):
+    lines = ["email,password,first_name,last_name"]
+    lines += [f"{prefix}{i}@example.com,password-{i},First{i},Last{i}" for i in range(count)]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    folder = tempfile.mkdtemp()
+
+    db.DB_NAME = os.path.join(folder, "bench_loop.db")
+    t0 = time.perf_counter()
+    for i in range(sample):
+        auth.signup(f"loop{i}@example.com", f"password-{i}", f"First{i}", f"Last{i}")
+    per_user = (time.perf_counter() - t0) / sample
+    print(f"signup loop  {1 / per_user:>8.1f} users/s  ~{per_user * users:>7.0f}s for {users} "
+          f"(extrapolated from {sample})")
+    db.close_all()
+
+    db.DB_NAME = os.path.join(folder, "bench_bulk.db")
+    t0 = time.perf_counter()
+    created, errors = provision.provision(io.StringIO(make_csv(users, "bulk")), processes)
+    elapsed = time.perf_counter() - t0
+    print(f"provision    {created / elapsed:>8.1f} users/s  {elapsed:>8.0f}s for {created} "
+          f"({processes or os.cpu_count()} processes, {len(errors)} errors)")
+    db.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Frame-time comparison: old immediate-mode canvas rebuild vs GameRenderer.
+# Run from the areteDemo folder:  python -m benchmarks.bench_render [frames]
+#
+# Only the CPU side of building/updating canvas instructions is timed, which is
+# what the rebuild path was spending most of the frame on.
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+from kivy.core.window import Window  # noqa: F401  (creates the GL context for textures)
+from kivy.graphics import Color, Rectangle, Ellipse, PushMatrix, PopMatrix, Rotate
+from kivy.uix.widget import Widget
+
+from game.assets import AssetCache
+from game.constants import WINDOW_WIDTH, WINDOW_HEIGHT, FLOOR_HEIGHT, PLAYER_RADIUS
+from game.render import GameRenderer
+from game.obstacles import ObstacleStore
+
+BG = "images/background_sea.png"
+SOURCES = {0: "images/obstacle_sea.png", 1: "images/obstacle_forest.png"}
+
+
+def make_obstacles(n):
+    store = ObstacleStore()
+    step = (WINDOW_WIDTH + 200) / max(n, 1)
+    for i in range(n):
+        store.spawn(i * step, FLOOR_HEIGHT, 80, i % 2)
+    return store
+
+
+# the draw code GameWidget.update used before the retained renderer
+def draw_immediate(widget, obstacles, player_y, angle):
+    widget.canvas.before.clear()
+    with widget.canvas.before:
+        Color(1, 1, 1, 1)
+        Rectangle(pos=(0, 0), size=(WINDOW_WIDTH, WINDOW_HEIGHT), source=BG)
+        for slot in obstacles:
+            Color(1, 1, 1, 1)
+            size = obstacles.size[slot]
+            Rectangle(pos=(obstacles.x(slot), obstacles.y[slot]), size=(size, size),
+                      source=SOURCES[obstacles.theme[slot]])
+        PushMatrix()
+        r = Rotate()
+        r.angle = angle
+        r.origin = (400, player_y)
+        Color(1, 1, 1, 1)
+        Ellipse(pos=(400 - PLAYER_RADIUS, player_y - PLAYER_RADIUS), size=(PLAYER_RADIUS * 2, PLAYER_RADIUS * 2))
+        PopMatrix()
+        Color(0.96, 0.96, 0.96)
+        small = PLAYER_RADIUS * 0.5
+        Ellipse(pos=(400 - small / 2, player_y - small / 2), size=(small, small))
+
+
+def draw_retained(renderer, assets, obstacles, player_y, angle):
+    renderer.set_background(assets.background_texture(0))
+    renderer.scroll_background(obstacles.offset, 1 / 60)
+    renderer.sync_obstacles(obstacles, assets.obstacle_textures)
+    renderer.set_player(400, player_y, angle, [1, 1, 1, 1])
+
+
+def run(label, draw, frames, n):
+    obstacles = make_obstacles(n)
+    times = []
+    for frame in range(frames):
+        obstacles.scroll(4)
+        # recycle the ones that left the screen so the count stays at n
+        while len(obstacles) and obstacles.right(obstacles.order[0]) < 0:
+            obstacles.popleft()
+            obstacles.spawn(WINDOW_WIDTH + 100, FLOOR_HEIGHT, 80, frame % 2)
+        t0 = time.perf_counter()
+        draw(obstacles, FLOOR_HEIGHT + PLAYER_RADIUS + (frame % 30), frame * 3.0)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    mean = sum(times) / len(times) * 1000
+    p95 = times[int(len(times) * 0.95)] * 1000
+    print(f"{label:<10} obstacles={n:<5} mean={mean:7.3f} ms   p95={p95:7.3f} ms")
+    return mean
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    assets = AssetCache().load()
+    for n in (5, 20, 100):
+        old = Widget()
+        mean_old = run("immediate", lambda obs, y, a: draw_immediate(old, obs, y, a), frames, n)
+        new = Widget()
+        renderer = GameRenderer(new.canvas.before, WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_RADIUS)
+        mean_new = run("retained", lambda obs, y, a: draw_retained(renderer, assets, obs, y, a), frames, n)
+        print(f"{'':<10} speedup x{mean_old / mean_new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
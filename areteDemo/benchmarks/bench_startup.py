@@ -0,0 +1,68 @@
+# Time from process start to the first frame of the login screen, for the
+# staged startup in main.py vs an eager one (game module, passlib and the
+# database loaded and every screen built before the first frame, as main.py
+# used to do). Each run is a fresh process. Needs a display.
+# Run from the areteDemo folder:  python -m benchmarks.bench_startup [runs]
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+T0 = time.perf_counter()
+
+
+def child(mode):
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    import main
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    imported = time.perf_counter()
+
+    if mode == "eager":
+        import capstone_game_demo_kivy  # noqa: F401
+        main.db.init_db()
+        main.security.get_context()
+
+    class BenchApp(main.AreteApp):
+        def build(self):
+            sm = super().build()
+            if mode == "eager":
+                for name in list(sm.factories):
+                    sm.get_screen(name)
+            self.built = time.perf_counter()
+            return sm
+
+        def on_start(self):
+            super().on_start()
+            Window.bind(on_flip=self._on_flip)
+
+        def _on_flip(self, *_):
+            Window.unbind(on_flip=self._on_flip)
+            self.first_frame = time.perf_counter()
+            Clock.schedule_once(lambda dt: self.stop())
+
+    app = BenchApp()
+    app.run()
+    print(json.dumps({"import": imported - T0, "build": app.built - T0, "first_frame": app.first_frame - T0}))
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+        return
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'mode':<8} {'imports ms':>11} {'build ms':>9} {'first frame ms':>15}   (medians of {runs} runs)")
+    for mode in ("eager", "staged"):
+        results = []
+        for _ in range(runs):
+            out = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", mode],
+                                 capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+        med = {key: statistics.median(r[key] for r in results) * 1000 for key in results[0]}
+        print(f"{mode:<8} {med['import']:>11.0f} {med['build']:>9.0f} {med['first_frame']:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
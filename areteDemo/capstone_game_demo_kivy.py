@@ -1,49 +1,36 @@
+import os
+import time
+
 from kivy.app import App
 from kivy.clock import Clock
 from kivy.core.window import Window
-from kivy.graphics import Color, Rectangle, Ellipse, RoundedRectangle, PushMatrix, PopMatrix, Rotate
 from kivy.uix.widget import Widget
-from kivy.uix.label import Label
-from kivy.properties import NumericProperty, BooleanProperty, ListProperty, ObjectProperty
-import random
-import time
+from kivy.properties import NumericProperty, BooleanProperty, ObjectProperty
+from kivy.logger import Logger
+
+# Game constants live in game/constants.py so the headless simulation can share them
+from game.constants import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_X, PLAYER_RADIUS, INITIAL_SPEED, THEME_COUNT,
+    OBSTACLE_PREVIEW_SECONDS, RENDER_FPS,
+)
+from game.assets import get_cache
+from game.audio import AudioEngine
+from game.layout import LogicalViewport
+from game.gc_policy import GcMonitor, GcPolicy
+from game.hud import GlyphAtlas, GlyphText, HudCounter
+from game.input import JUMP, InputQueue, LatencyMonitor
+from game.overlay import ProfilerOverlay
+from game.prefetch import BackgroundPrefetcher, SwitchHitchMonitor
+from game.profiler import FrameProfiler
+from game.render import GameRenderer
+from game.replay import Replay, ReplayError, ReplayPlayer, ReplayRecorder, compare
+from game.simulation import GameSimulation
+from game.timestep import FixedStepper
 
 # KNOWN ISSUES/CHANGES
 # HUD Display not showing up, specifically during gameplay, though the values seem to be updating accordingly
-# Window scaling has been partially added
 # Removed health system, replacing it with a timer that ends the game after 5 minutes
 
-# Game constants
-WINDOW_WIDTH = 1920
-WINDOW_HEIGHT = 1080
-FLOOR_HEIGHT = 150
-
-# BASE_FLOOR_RATIO = 0.15
-
-PLAYER_RADIUS = 30
-GRAVITY = -1200  # pixels per second^2 (negative = pulls down)
-JUMP_VELOCITY = 700  # initial jump velocity - tuned for feel
-
-INITIAL_SPEED = 240  # pixels/second (how fast obstacles move left)
-SPEED_INCREASE_PER_5_AVOIDED = 10  # speed increases incrementally for every 5 obstacles avoided
-OBSTACLE_MIN_GAP = 350
-OBSTACLE_MAX_GAP = 900
-SPAWN_INTERVAL_BASE = 2.0  # base interval between obstacles (sec) - modified by speed
-
-SLOW_ON_HIT_MULTIPLIER = 0.9  # speed multiplier upon hit
-GAME_DURATION = 300  # 5 minute game duration
-
-#SPAWN_PAUSE_ON_BG_SWITCH = 2.0  # pause obstacle spawning after background switches (sec)
-OBSTACLE_PREVIEW_SECONDS = 5.5  # spawn NEXT theme obstacles this many seconds before bg switch
-
-
-class Obstacle:
-    def __init__(self, x, y, size, source):
-        self.x = x
-        self.y = y
-        self.size = size
-        self.source = source
-        self.passed = False
 
 class GameWidget(Widget):
     speed = NumericProperty(INITIAL_SPEED)  # current world speed (px/s)
@@ -51,104 +38,184 @@ class GameWidget(Widget):
     
     player_y = NumericProperty(0.0)  # center y of player
     player_vy = NumericProperty(0.0)
-    player_x = NumericProperty(400.0)  # horizontal position of player (constant)  # change this number only
+    player_x = NumericProperty(PLAYER_X)  # horizontal position of player (constant)
     player_radius = NumericProperty(PLAYER_RADIUS)
     
     is_running = BooleanProperty(False)
     is_counting_down = BooleanProperty(False)
     countdown_value = NumericProperty(0)
     
-    obstacles = ListProperty([])
     score_distance = NumericProperty(0.0)
     avoided_count = NumericProperty(0)
     
     game_over = BooleanProperty(False)
     on_game_over_callback = ObjectProperty(None, allownone=True)
 
-    def __init__(self, embedded=False, **kwargs):
+    # game events, each with the time.perf_counter() timestamp it was detected at;
+    # the audio engine plays its sounds on these
+    __events__ = ("on_jump", "on_hit", "on_theme_switch", "on_countdown", "on_game_end")
+
+    _active = False  # shown and holding the keyboard (see activate/deactivate)
+    _update_event = None  # the update loop, scheduled only while a game/countdown runs
+
+    def __init__(self, embedded=False, render_fps=RENDER_FPS, **kwargs):
         super().__init__(**kwargs)
         if not embedded:
-            Window.size = (WINDOW_WIDTH, WINDOW_HEIGHT)
-        Window.bind(on_key_down=self._on_key_down)
-        #Window.bind(on_resize=self._on_resize)
-        
-        self.player_y = FLOOR_HEIGHT + PLAYER_RADIUS
+            Window.size = (WINDOW_WIDTH, WINDOW_HEIGHT)  # initial size only; any size works
+
+        # all game rules run in the simulation; this widget draws it and feeds it input.
+        # Physics advances in fixed SIM_DT steps whatever the render rate is.
+        self.sim = GameSimulation()
+        self.stepper = FixedStepper()
+        self.player_y = self.sim.player_y
+        # every session is logged (seed + jump frames) and saved to replays/ at game over;
+        # play_replay() feeds a log back in instead of the keyboard
+        self.recorder = ReplayRecorder(self.sim)
+        self.replay_player = None
+        self.last_replay = None
+        # key presses are timestamped and applied at the physics step they happened in;
+        # latency tracks press -> first frame showing the jump (see game/input.py)
+        self.inputs = InputQueue()
+        self.latency = LatencyMonitor()
         
         # Player color property (Merged from our work)
         self.player_color = [1, 1, 1, 1]
 
-        self._last_spawn_x = WINDOW_WIDTH + 100
-        self._spawn_accumulator = 0.0
-        self._time = time.time()
-        self._slow_start_speed = None
-        self._slow_until = None
-
-        self._last_speed_milestone = 0
-
-        self.obstacle_sources = {
-            0: "images/obstacle_sea.png",
-            1: "images/obstacle_forest.png",
-            2: "images/obstacle_desert.png",
-            3: "images/obstacle_sky.png",
-            4: "images/obstacle_space.png",
-        }
-
-        self._spawn_pause_remaining = 0.0  # spawn pause timer
-
-        # backgrounds
-        self.backgrounds = [
-            "images/background_sea.png",
-            "images/background_forest.png",
-            "images/background_desert.png",
-            "images/background_sky.png",
-            "images/background_space.png"
-        ]
+        # textures are decoded/uploaded once (obstacle sprites packed into one atlas)
+        self.assets = get_cache(target_height=Window.height)
         self.bg_index = 0
-        self.bg_source = self.backgrounds[self.bg_index]
-
-        # background switch timer
-        self._bg_elapsed = 0.0
-        self.BG_SWITCH_SECONDS = 20.0
-
-        # UI labels (bold colors so they show on sea background)
-        self.label_countdown = Label(
-            text="", font_size=56, pos=(WINDOW_WIDTH/2 - 60, WINDOW_HEIGHT/2 - 28),
-            color=(0, 0, 0, 1), bold=True
+        self._bg_texture = self.assets.background_texture(0)
+        # the next theme's background is decoded off-thread during the obstacle preview window
+        self.prefetcher = BackgroundPrefetcher(self.assets)
+        self.switch_monitor = SwitchHitchMonitor()
+        # every sound is loaded here, never during play (see game/audio.py)
+        self.audio = AudioEngine().load()
+        self.audio.attach(self)
+
+        # UI text is drawn from pre-rasterized glyphs and only touched when it changes
+        # (see game/hud.py); the in-game counters are also capped at HUD_UPDATE_HZ
+        self.label_countdown = GlyphText(
+            GlyphAtlas(56, bold=True), max_chars=4, halign="center",
+            pos=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 - 28)
         )
         self.add_widget(self.label_countdown)
-        self.hud = Label(
-            text="", font_size=22, pos=(10, WINDOW_HEIGHT - 36),
-            color=(0, 0, 0, 1), bold=True
-        )
+        self.hud = GlyphText(GlyphAtlas(22, bold=True), pos=(10, WINDOW_HEIGHT - 36))
         self.add_widget(self.hud)
-        self.msg = Label(
-            text="Press SPACE or ENTER to start", font_size=26, pos=(WINDOW_WIDTH/2 - 200, WINDOW_HEIGHT/2 + 30),
-            color=(0, 0, 0, 1), bold=True
+        self.hud_counter = HudCounter(self.hud)
+        self.msg = GlyphText(
+            GlyphAtlas(26, bold=True), max_chars=80, halign="center",
+            pos=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 30)
         )
+        self.msg.text = "Press SPACE or ENTER to start"
         self.add_widget(self.msg)
 
-        # schedule update
-        Clock.schedule_interval(self.update, 1.0/60.0)
-        # Game graphics drawn to canvas.before so Labels (children) render on top
-
-        # Window resize handler to adjust player and UI positions (not fully implemented)
-        #def _on_resize(self, *_):
-        #    self.player_x = self.width * 0.15
-        #    self.player_y = self.floor_height + PLAYER_RADIUS
-        #
-        #    self.label_countdown.center = self.center
-        #    self.msg.center = (self.width / 2, self.height * 0.6)
-        #    self.hud.pos = (10, self.height - 36)
-        #
-        #@property
-        #def floor_height(self):
-        #    return self.height * BASE_FLOOR_RATIO
+        # frame profiler (F3 toggles the overlay, F4 exports JSON/CSV to profiles/)
+        self.profiler = FrameProfiler(enabled=os.environ.get("ARETE_PROFILE") == "1")
+        self.profiler_overlay = ProfilerOverlay(
+            self.profiler, pos=(WINDOW_WIDTH - 620, WINDOW_HEIGHT - 190), size=(600, 180)
+        )
+        self.add_widget(self.profiler_overlay)
+        self.sim.profiler = self.profiler
+        # ARETE_GC=freeze|tuned|off changes gc behaviour while a game runs (see game/gc_policy.py);
+        # with the profiler on, gc collections and pool growth show up as overlay counters
+        self.gc_policy = GcPolicy(os.environ.get("ARETE_GC", "default"))
+        self.gc_monitor = GcMonitor() if self.profiler.enabled else None
+
+        self._redraw = Clock.create_trigger(self._draw_idle)
+
+        # Game coordinates are logical WINDOW_WIDTH x WINDOW_HEIGHT; one transform at the
+        # root of the canvas scales everything (graphics and HUD) to the widget's size.
+        self.viewport = LogicalViewport(self, on_resize=self._on_viewport_resize)
+
+        # Game graphics drawn to canvas.before so Labels (children) render on top.
+        # Instructions are built once here and only updated in place each frame.
+        self._roll_angle = 0.0
+        self.renderer = GameRenderer(self.canvas.before, WINDOW_WIDTH, WINDOW_HEIGHT, PLAYER_RADIUS)
+
+        # update runs at the render rate (physics rate is fixed), but only while a
+        # countdown or game is in progress; otherwise the last frame just stays up
+        self._frame_interval = 1.0/render_fps if render_fps else 0
+        if not embedded:
+            self.activate()
+
+    def activate(self):
+        # widget is on screen: take the keyboard and draw the current frame
+        if self._active:
+            return
+        self._active = True
+        Window.bind(on_key_down=self._on_key_down, on_flip=self._on_flip)
+        self._sync_loop()
+        self._redraw()
+
+    def deactivate(self):
+        # widget is hidden: release the keyboard and stop all clock work (pauses a running game)
+        if not self._active:
+            return
+        self._active = False
+        Window.unbind(on_key_down=self._on_key_down, on_flip=self._on_flip)
+        Clock.unschedule(self._countdown_tick)
+        self.is_counting_down = False
+        self.is_running = False
+        self.audio.stop_all()
+        self._sync_loop()
+
+    def on_is_running(self, instance, running):
+        if running:
+            self.gc_policy.begin_play()
+        else:
+            self.gc_policy.end_play()
+        self._sync_loop()
+
+    def on_is_counting_down(self, *_):
+        self._sync_loop()
+
+    def _sync_loop(self):
+        wanted = self._active and (self.is_running or self.is_counting_down)
+        if wanted and self._update_event is None:
+            self._update_event = Clock.schedule_interval(self.update, self._frame_interval)
+        elif not wanted and self._update_event is not None:
+            self._update_event.cancel()
+            self._update_event = None
+            self._redraw()
+
+    def _on_viewport_resize(self, scale):
+        # smaller windows render a pre-scaled background (see game/assets.py)
+        if self.assets.set_target_height(WINDOW_HEIGHT * scale):
+            self.prefetcher.prefetch(self.bg_index)
+        self._redraw()
+
+    def _draw_idle(self, dt):
+        # one frame for state changes made while the loop is stopped (reset, game over)
+        self.draw(0)
+
+    def on_jump(self, timestamp):
+        pass
+
+    def on_hit(self, timestamp):
+        pass
+
+    def on_theme_switch(self, timestamp):
+        pass
+
+    def on_countdown(self, timestamp):
+        pass
+
+    def on_game_end(self, timestamp):
+        pass
 
     # Helper method to set color (Merged from our work)
     def set_player_color(self, r, g, b, a=1):
         self.player_color = [r, g, b, a]
     
     def _on_key_down(self, window, key, scancode, codepoint, modifiers):
+        # F3 = 284 toggles the profiler overlay, F4 = 285 exports the profile
+        if key == 284:
+            self.profiler_overlay.toggle()
+            return
+        if key == 285 and self.profiler.enabled:
+            json_path, csv_path = self.profiler.export()
+            Logger.info(f"Profiler: wrote {json_path} and {csv_path}")
+            return
         # SPACE = 32, Enter/Return = 13 (both start countdown and restart; only SPACE jumps)
         if key not in (32, 13):
             return
@@ -156,244 +223,224 @@ class GameWidget(Widget):
             self.msg.text = ""
             self.start_countdown(3)
         elif self.is_running and not self.game_over:
-            if key == 32 and self.on_ground():
-                self.player_vy = JUMP_VELOCITY
+            if key == 32 and self.replay_player is None:
+                self.inputs.push(JUMP)
         elif self.game_over:
             self.reset_game()
 
+    def _on_flip(self, window):
+        # the frame is drawn and about to be swapped onto the screen
+        self.latency.presented()
+
     def start_countdown(self, seconds):
         self.countdown_value = seconds
         self.is_counting_down = True
         self.label_countdown.text = str(int(self.countdown_value))
+        self.dispatch("on_countdown", time.perf_counter())
         Clock.schedule_interval(self._countdown_tick, 1.0)  # tick each second
 
     def _countdown_tick(self, dt):
         self.countdown_value -= 1
         if self.countdown_value > 0:
             self.label_countdown.text = str(int(self.countdown_value))
+            self.dispatch("on_countdown", time.perf_counter())
             return True
         else:
             self.label_countdown.text = ""
-            self.is_counting_down = False
+            # running first so the update loop isn't stopped and restarted in between
             self.is_running = True
-            self._time = time.time()
+            self.is_counting_down = False
             return False  # unschedule
 
-    def reset_game(self):
-        # reset all state
-        self.speed = INITIAL_SPEED
-        self.base_speed = INITIAL_SPEED
-        self.player_y = FLOOR_HEIGHT + PLAYER_RADIUS
-        self.player_vy = 0.0
-        
-        self.obstacles = []
-        self._spawn_accumulator = 0.0
-        
-        self.score_distance = 0.0
-        self.avoided_count = 0
+    def reset_game(self, seed=None):
+        # reset all state (a fresh random seed each game unless one is given)
+        self.sim.reset(seed)
+        self.recorder.start(self.sim)
+        self.replay_player = None
+        self.inputs.clear()
+        self.latency.reset()
+        self.stepper.reset()
+        self._pull_sim_state()
+        self.bg_index = self.sim.bg_index
+        self.switch_monitor.reset()
         self.is_running = False
         self.is_counting_down = False
         self.game_over = False
         
         self.msg.text = "Press SPACE or ENTER to start"
         self.label_countdown.text = ""
-        self.hud.text = ""
-        self._slow_start_speed = None
-        
-        self._last_speed_milestone = 0
-        self.bg_index = 0
-        self.bg_source = self.backgrounds[self.bg_index]
-        self._bg_elapsed = 0.0
-        self._slow_until = None
-        self._spawn_pause_remaining = 0.0
-
+        self.hud_counter.reset()
+        self._redraw()
 
     def on_ground(self):
-        # player's center y equals ground + radius
-        return abs(self.player_y - (FLOOR_HEIGHT + PLAYER_RADIUS)) < 1.0 and self.player_vy <= 0.0
-
-    def spawn_obstacle(self):
-        # spawn a square obstacle at right side
-        size = random.randint(70, 100)
-        x = WINDOW_WIDTH + random.randint(0, 120)
-        y = FLOOR_HEIGHT
-
-        # If we are within N seconds of a background switch,
-        # spawn obstacles using the NEXT background's obstacle theme
-        time_to_switch = self.BG_SWITCH_SECONDS - self._bg_elapsed
-        if time_to_switch <= OBSTACLE_PREVIEW_SECONDS:
-            preview_index = (self.bg_index + 1) % len(self.backgrounds)
-        else:
-            preview_index = self.bg_index
-
-        src = self.obstacle_sources.get(preview_index, "images/obstacle_default.png")
-        self.obstacles.append(Obstacle(x, y, size, src))
+        return self.sim.on_ground()
+
+    def _pull_sim_state(self):
+        # mirror the simulation into the Kivy properties other code binds to
+        sim = self.sim
+        self.speed = sim.speed
+        self.base_speed = sim.base_speed
+        self.player_y = sim.player_y
+        self.player_vy = sim.player_vy
+        self.score_distance = sim.score_distance
+        self.avoided_count = sim.avoided_count
 
     def update(self, dt):
         # dt safety
         if dt <= 0:
             return
-
-        # draw fresh to canvas.before so Labels stay visible on top
-        self.canvas.before.clear()
-        with self.canvas.before:
-            # draw background
-            Color(1, 1, 1, 1)
-            Rectangle(
-                pos=(0, 0),
-                size=(WINDOW_WIDTH, WINDOW_HEIGHT),
-                source=self.bg_source
-            )
+        profiler = self.profiler
+        profiler.begin("update")
 
         # update only if running (but still draw static HUD)
         if self.is_running and not self.game_over:
+            profiler.begin("physics")
+            sim = self.sim
+            replay_player = self.replay_player
+            inputs = self.inputs
+            latency = self.latency
+            steps = self.stepper.advance(dt)
+            jumps_before = sim.jump_count
+            hits_before = sim.hit_count
+            if inputs:
+                render_time = sim.elapsed + steps * sim.dt + self.stepper.accumulator
+                inputs.map_to_sim(time.perf_counter(), render_time, sim.elapsed)
+            for _ in range(steps):
+                jumps = sim.jump_count
+                if replay_player is not None:
+                    replay_player.before_step(sim)
+                elif inputs:
+                    self._apply_inputs(sim.elapsed)
+                sim.step()
+                if sim.jump_count != jumps:
+                    latency.jumped()
+                if sim.game_over:
+                    break
+            self._pull_sim_state()
+            profiler.end("physics")
+            if sim.jump_count != jumps_before:
+                self.dispatch("on_jump", time.perf_counter())
+            if sim.hit_count != hits_before:
+                self.dispatch("on_hit", time.perf_counter())
             # game end condition
-            elapsed_time = time.time() - self._time
-            if elapsed_time >= GAME_DURATION:
-                self.end_game()
-                return           
-
-            # background change every 10 seconds
-            self._bg_elapsed += dt
-            if self._bg_elapsed >= self.BG_SWITCH_SECONDS:
-                self._bg_elapsed = 0.0
-                self.bg_index = (self.bg_index + 1) % len(self.backgrounds)
-                self.bg_source = self.backgrounds[self.bg_index]
-                # self._spawn_pause_remaining = SPAWN_PAUSE_ON_BG_SWITCH
-                # self._spawn_accumulator = 0.0
-
-            # game end condition
-            elapsed_time = time.time() - self._time
-            if elapsed_time >= GAME_DURATION:
+            if sim.game_over:
+                profiler.end("update")
                 self.end_game()
                 return
-            
-            # move obstacles left by speed*dt
-            for ob in list(self.obstacles):
-                ob.x -= self.speed * dt
-
-            # spawn logic: spawn when last obstacle sufficiently left
-            # simpler: use accumulator and a spawn interval scaled by speed
-            # faster speed = shorter intervals
-            if self._spawn_pause_remaining > 0.0:
-                self._spawn_pause_remaining -= dt
-            else:
-                spawn_interval = max(0.4, SPAWN_INTERVAL_BASE)
-                self._spawn_accumulator += dt
-                if self._spawn_accumulator >= spawn_interval:
-                    self._spawn_accumulator = 0.0
-                    self.spawn_obstacle()
-
-            # physics: player vertical
-            self.player_vy += GRAVITY * dt
-            self.player_y += self.player_vy * dt
-            # collision with ground
-            if self.player_y < FLOOR_HEIGHT + PLAYER_RADIUS:
-                self.player_y = FLOOR_HEIGHT + PLAYER_RADIUS
-                self.player_vy = 0.0
-
-            # speed increase logic: every 5 avoided, increase base speed by fixed amount
-            if self.avoided_count > 0 and (self.avoided_count % 5 == 0):
-                self.base_speed = self.base_speed + SPEED_INCREASE_PER_5_AVOIDED
-
-            # distance traveled (approx): speed * elapsed_time increments distance
-            self.score_distance += self.speed * dt
-
-            # collision detection: circle vs squares
-            for ob in list(self.obstacles):
-                # obstacle bounding box
-                ob_left = ob.x
-                ob_right = ob.x + ob.size
-                ob_bottom = ob.y
-                ob_top = ob.y + ob.size
-
-                # circle center
-                cx = self.player_x
-                cy = self.player_y
-
-                # AABB-circle collision test
-                nearest_x = max(ob_left, min(cx, ob_right))
-                nearest_y = max(ob_bottom, min(cy, ob_top))
-                dx = cx - nearest_x
-                dy = cy - nearest_y
-                if (dx*dx + dy*dy) <= (self.player_radius * self.player_radius):
-                    # collision!
-                    try:
-                        self.obstacles.remove(ob)
-                    except ValueError:
-                        pass
-                    # slow effect
-                    self._slow_start_speed = self.speed
-                    self.base_speed = self.base_speed  # base remains but we'll interpolate from _slow_start_speed up to base
-                    # immediately set current speed lower to show impact
-                    self.speed = self._slow_start_speed * SLOW_ON_HIT_MULTIPLIER
-                    self._slow_start_speed = self.speed
-                    if self.speed < 200:  # don't let it get too slow
-                        self.speed = 200
-                    break  # only one hit per frame
-
-            # obstacles that passed left edge without collision -> avoided
-            for ob in list(self.obstacles):
-                if not ob.passed and (ob.x + ob.size) < 0:
-                    ob.passed = True
-                    self.avoided_count += 1
-                    try:
-                        self.obstacles.remove(ob)
-                    except ValueError:
-                        pass
+
+            if sim.time_to_switch <= OBSTACLE_PREVIEW_SECONDS:
+                self.prefetcher.prefetch((sim.bg_index + 1) % THEME_COUNT)
+            switched_to = None
+            if sim.bg_index != self.bg_index:
+                self.bg_index = switched_to = sim.bg_index
+                self.dispatch("on_theme_switch", time.perf_counter())
+            self.switch_monitor.frame(dt, switched_to)
 
         # draw dynamic objects regardless of running (so countdown/score display)
-        with self.canvas.before:
-            # draw obstacles
-            for ob in self.obstacles:
-                Color(1, 1, 1, 1)
-                Rectangle(pos=(ob.x, ob.y), size=(ob.size, ob.size), source=ob.source)
-
-            # draw player (rolling circle)
-            # we draw rotation to visually roll the circle depending on speed
-            push = PushMatrix()
-            r = Rotate()
-            # rotation angle derived from speed and time (simulate rolling)
-            # radius = player_radius, angular velocity = speed / radius (rad/s), convert to degrees
-            ang_speed = (self.speed / (self.player_radius)) * (180.0 / 3.14159265)  # degrees per second
-            # accumulate angle in a simple way using time:
-            if not hasattr(self, "_roll_angle"):
-                self._roll_angle = 0.0
-            self._roll_angle += ang_speed * (Clock.get_time() - getattr(self, "_last_clock_time", Clock.get_time()))
-            self._last_clock_time = Clock.get_time()
-            r.angle = self._roll_angle
-            r.origin = (self.player_x, self.player_y)
-            
-            # Apply dynamic player color (Merged from our work)
-            Color(*self.player_color)
-            
-            Ellipse(pos=(self.player_x - self.player_radius, self.player_y - self.player_radius),
-                    size=(self.player_radius*2, self.player_radius*2))
-            PopMatrix()
-
-            # player inner eye or dot
-            Color(0.96, 0.96, 0.96)
-            small = self.player_radius * 0.5
-            Ellipse(pos=(self.player_x - small/2, self.player_y - small/2), size=(small, small))
-
-        # draw HUD text (keep showing during game over so final stats are visible)
+        profiler.begin("render")
+        self.draw(dt)
+        profiler.end("render")
+
+        # HUD text (the final score set by end_game stays up during game over)
+        profiler.begin("hud")
         if not self.game_over:
-            self.hud.text = f"Distance: {int(self.score_distance)}    Avoided: {self.avoided_count}"
+            self.hud_counter.update(dt, int(self.score_distance), self.avoided_count)
+        profiler.end("hud")
+
+        profiler.end("update")
+        if profiler.enabled:
+            profiler.count("obstacles", len(self.sim.obstacles))
+            profiler.count("instructions", self.renderer.instruction_count())
+            profiler.count("rects_made", self.renderer.rect_pool.created)
+            profiler.count("slots_made", self.sim.obstacles.slots.created)
+            profiler.count("input_ms", round(self.latency.last_ms, 1))
+            profiler.count("audio_ms", round(self.audio.last_latency_ms, 2))
+            profiler.count("voices_stolen", self.audio.stolen)
+            if self.gc_monitor is not None:
+                profiler.count("gc_collections", sum(self.gc_monitor.collections))
+                profiler.count("gc_gen2", self.gc_monitor.collections[2])
+            profiler.frame(dt)
+            self.profiler_overlay.refresh(dt)
+
+    def _apply_inputs(self, step_start):
+        # everything pressed up to the start of this physics step
+        event = self.inputs.next_due(step_start)
+        while event is not None:
+            timestamp, action = event
+            if action == JUMP:
+                self.latency.press(timestamp)
+                self.sim.request_jump()
+            event = self.inputs.next_due(step_start)
+
+    def draw(self, dt):
+        # keep the old background for a frame or two if the prefetch hasn't landed yet
+        texture = self.assets.peek_background(self.bg_index)
+        if texture is None:
+            self.prefetcher.prefetch(self.bg_index)
         else:
-            final_score = int(self.score_distance) + self.avoided_count * 100
-            self.hud.text = f"FINAL — Score: {final_score}"
+            self._bg_texture = texture
+        # theme changes cross-fade only while playing; a reset just shows the first theme
+        self.renderer.set_background(self._bg_texture, fade=self.is_running)
+        # draw between the last two physics states so motion is smooth at any render rate
+        player_y, offset = self.sim.interpolated(self.stepper.alpha)
+        # background layers scroll with the distance travelled, interpolated like the rest
+        sim = self.sim
+        distance = sim.score_distance - sim.speed * sim.dt * (1.0 - self.stepper.alpha)
+        self.renderer.scroll_background(max(0.0, distance), dt)
+        self.renderer.sync_obstacles(self.sim.obstacles, self.assets.obstacle_textures, offset)
+
+        # rolling circle: angular velocity = speed / radius (rad/s), converted to degrees
+        ang_speed = (self.speed / (self.player_radius)) * (180.0 / 3.14159265)  # degrees per second
+        self._roll_angle = (self._roll_angle + ang_speed * dt) % 360.0
+        self.renderer.set_player(self.player_x, player_y, self._roll_angle, self.player_color)
 
     def end_game(self):
         self.is_running = False
         self.game_over = True
-        final_score = int(self.score_distance) + self.avoided_count * 100
+        final_score = self.sim.final_score
+        self.dispatch("on_game_end", time.perf_counter())
+        self._finish_replay()
+        if self.latency.samples:
+            s = self.latency.summary()
+            Logger.info(f"Input latency: p50 {s['p50']:.1f} ms, p95 {s['p95']:.1f} ms, "
+                        f"max {s['max']:.1f} ms over {s['samples']} jumps")
+        if self.audio.latency:
+            s = self.audio.summary()
+            Logger.info(f"Audio trigger latency: p50 {s['p50']:.2f} ms, p95 {s['p95']:.2f} ms, "
+                        f"{self.audio.played} played, {self.audio.stolen} voices stolen")
+        self.hud_counter.show(f"FINAL — Score: {final_score}")
         self.msg.text = f"Game Over — Score: {final_score}\nPress SPACE or ENTER to play again"
         if self.on_game_over_callback:
             self.on_game_over_callback()
 
+    def _finish_replay(self):
+        self.last_replay = self.recorder.finish()
+        if self.replay_player is not None:
+            mismatches = compare(self.replay_player.replay, self.last_replay)
+            Logger.info(f"Replay: score {self.last_replay.final_score} "
+                        + ("matches the log" if not mismatches else "MISMATCH " + ", ".join(mismatches)))
+            return
+        try:
+            Logger.info(f"Replay: wrote {self.recorder.save()}")
+        except OSError as e:
+            Logger.warning(f"Replay: could not save: {e}")
+
+    def play_replay(self, replay):
+        # watch a recorded session at normal speed (game/replay.py re-simulates unthrottled)
+        if abs(1.0 / replay.physics_hz - self.sim.dt) > 1e-9 or replay.duration != self.sim.duration:
+            raise ReplayError(f"replay was recorded at {replay.physics_hz} Hz / {replay.duration}s")
+        Clock.unschedule(self._countdown_tick)
+        self.reset_game(seed=replay.seed)
+        self.replay_player = ReplayPlayer(replay)
+        self.msg.text = ""
+        self.is_running = True
+
 class CapstoneGameDemoApp(App):
     def build(self):
         root = GameWidget()
+        # ARETE_REPLAY=replays/<file>.arpl plays a recorded session instead
+        if os.environ.get("ARETE_REPLAY"):
+            root.play_replay(Replay.load(os.environ["ARETE_REPLAY"]))
         return root
 
 if __name__ == '__main__':
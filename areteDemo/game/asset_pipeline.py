@@ -0,0 +1,111 @@
+# Offline texture build (needs Pillow). For each display height in TEXTURE_HEIGHTS:
+#   - every background made to tile seamlessly (its left edge cross-faded with a band
+#     cut from the right) and scaled to the power-of-two size closest to the logical
+#     window size at that height (RGB), so it scrolls with plain repeat wrap on GLES2
+#   - one obstacle sheet: each sprite scaled to the largest size it is drawn at
+#     (OBSTACLE_MAX_SIZE logical px) and packed side by side (RGBA)
+# Pixels are stored bottom row first (GL order) as raw or zlib bytes, listed in
+# assets/textures/manifest.json together with the source images' mtimes.
+# game.assets loads these at startup instead of decoding the PNGs.
+#
+#   python -m game.asset_pipeline [--raw] [--heights 540 720 1080]
+import argparse
+import json
+import math
+import os
+import time
+import zlib
+
+from PIL import Image
+
+from game.assets import (
+    BACKGROUND_IMAGES, OBSTACLE_IMAGES, TEXTURE_DIR, TEXTURE_HEIGHTS, TEXTURE_MANIFEST, MANIFEST_VERSION,
+)
+from game.constants import WINDOW_WIDTH, WINDOW_HEIGHT, OBSTACLE_MAX_SIZE
+
+ZLIB_LEVEL = 1  # inflate speed barely depends on the level; 1 builds fastest
+SEAM_BAND = 0.1  # fraction of a background's width blended across its wrap seam
+
+
+def pot(n):
+    # nearest power of two (in log scale), so the texture is stretched as little as possible
+    return 1 << max(0, round(math.log2(n)))
+
+
+def make_seamless(image, band=SEAM_BAND):
+    # Cut the rightmost band off and blend it into the left edge: column 0 becomes the
+    # column that followed the new right edge, fading into the original picture over
+    # the band. The result's right edge runs straight on into its left edge.
+    width, height = image.size
+    b = max(1, round(width * band))
+    left = image.crop((0, 0, b, height))
+    tail = image.crop((width - b, 0, width, height))
+    mask = Image.linear_gradient("L").rotate(90).resize((b, height))  # 0 at x=0, 255 at x=b
+    out = image.crop((0, 0, width - b, height))
+    out.paste(Image.composite(left, tail, mask), (0, 0))
+    return out
+
+
+def write_texture(image, name, out_dir, compression):
+    fmt = "rgba" if image.mode == "RGBA" else "rgb"
+    data = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM).tobytes()
+    if compression == "zlib":
+        data = zlib.compress(data, ZLIB_LEVEL)
+    file = name.replace("@", "-") + (".z" if compression == "zlib" else ".raw")
+    with open(os.path.join(out_dir, file), "wb") as f:
+        f.write(data)
+    return {"file": file, "width": image.width, "height": image.height,
+            "format": fmt, "compression": compression, "bytes": len(data)}
+
+
+def build(out_dir=TEXTURE_DIR, heights=TEXTURE_HEIGHTS, compression="zlib"):
+    os.makedirs(out_dir, exist_ok=True)
+    textures = {}
+    for height in heights:
+        scale = height / WINDOW_HEIGHT
+        size = (pot(WINDOW_WIDTH * scale), pot(height))
+        for theme, path in enumerate(BACKGROUND_IMAGES):
+            with Image.open(path) as image:
+                background = make_seamless(image.convert("RGB")).resize(size, Image.Resampling.LANCZOS)
+            name = f"background-{theme}@{height}"
+            textures[name] = write_texture(background, name, out_dir, compression)
+
+        cell = max(1, round(OBSTACLE_MAX_SIZE * scale))
+        sheet = Image.new("RGBA", (cell * len(OBSTACLE_IMAGES), cell))
+        for i, path in enumerate(OBSTACLE_IMAGES):
+            with Image.open(path) as image:
+                sheet.paste(image.convert("RGBA").resize((cell, cell), Image.Resampling.LANCZOS), (i * cell, 0))
+        name = f"obstacles@{height}"
+        entry = textures[name] = write_texture(sheet, name, out_dir, compression)
+        entry["regions"] = [[i * cell, 0, cell, cell] for i in range(len(OBSTACLE_IMAGES))]
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "heights": sorted(heights),
+        "sources": {path: os.path.getmtime(path) for path in BACKGROUND_IMAGES + OBSTACLE_IMAGES},
+        "textures": textures,
+    }
+    # written last and swapped in whole, so a half-finished build is never picked up
+    manifest_path = os.path.join(out_dir, os.path.basename(TEXTURE_MANIFEST))
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build pre-scaled game textures.")
+    parser.add_argument("--raw", action="store_true", help="store uncompressed pixels (bigger, no inflate)")
+    parser.add_argument("--heights", type=int, nargs="+", default=list(TEXTURE_HEIGHTS))
+    parser.add_argument("--out", default=TEXTURE_DIR)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    manifest = build(args.out, args.heights, "raw" if args.raw else "zlib")
+    total = sum(entry["bytes"] for entry in manifest["textures"].values())
+    print(f"{len(manifest['textures'])} textures, {total / 1e6:.1f} MB in {args.out} "
+          f"({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
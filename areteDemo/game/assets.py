@@ -0,0 +1,238 @@
+import json
+import os
+import zlib
+from collections import OrderedDict
+
+from kivy.core.image import Image as CoreImage, ImageLoader
+from kivy.graphics.texture import Texture
+from kivy.logger import Logger
+
+# image per theme index (sea, forest, desert, sky, space)
+OBSTACLE_IMAGES = [
+    "images/obstacle_sea.png",
+    "images/obstacle_forest.png",
+    "images/obstacle_desert.png",
+    "images/obstacle_sky.png",
+    "images/obstacle_space.png",
+]
+BACKGROUND_IMAGES = [
+    "images/background_sea.png",
+    "images/background_forest.png",
+    "images/background_desert.png",
+    "images/background_sky.png",
+    "images/background_space.png",
+]
+
+ATLAS_BASENAME = "assets/obstacles"  # -> assets/obstacles.atlas + assets/obstacles-0.png
+ATLAS_SIZE = 512  # all five sprites fit in one 512x512 page
+
+# Pre-scaled textures written by the offline pipeline (python -m game.asset_pipeline):
+# every background (seamless, power-of-two sized) and an obstacle sheet per display
+# height, stored as raw or zlib-compressed pixels with a JSON manifest, so startup
+# and theme switches skip PNG decoding. Without a (current) manifest the PNGs above
+# are loaded instead.
+TEXTURE_DIR = "assets/textures"
+TEXTURE_MANIFEST = os.path.join(TEXTURE_DIR, "manifest.json")
+MANIFEST_VERSION = 2  # 2: backgrounds are seamless and power-of-two sized
+TEXTURE_HEIGHTS = (540, 720, 1080)  # display heights the pipeline builds for
+
+# Optional cap on decoded background textures (bytes). None keeps all five resident
+# (~8 MB each at 1920x1080 RGBA); with a budget the least recently shown ones are dropped.
+# Leave room for at least two (current + prefetched next theme).
+BACKGROUND_BUDGET_BYTES = None
+
+
+def _atlas_is_stale(atlas_file):
+    if not os.path.exists(atlas_file):
+        return True
+    built = os.path.getmtime(atlas_file)
+    return any(os.path.getmtime(path) > built for path in OBSTACLE_IMAGES)
+
+
+def build_obstacle_atlas():
+    # Pack the obstacle sprites into one atlas (needs Pillow). Returns the .atlas path or None.
+    atlas_file = ATLAS_BASENAME + ".atlas"
+    if not _atlas_is_stale(atlas_file):
+        return atlas_file
+    try:
+        from kivy.atlas import Atlas
+        if Atlas.create(ATLAS_BASENAME, OBSTACLE_IMAGES, ATLAS_SIZE):
+            return atlas_file
+    except Exception as e:
+        Logger.warning(f"Assets: could not build obstacle atlas ({e}); using separate images")
+    return None
+
+
+def load_manifest(path=TEXTURE_MANIFEST):
+    # the pipeline manifest, or None if it is missing, another version or older than a source image
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    for source, mtime in manifest["sources"].items():
+        if not os.path.exists(source) or os.path.getmtime(source) > mtime:
+            Logger.warning("Assets: prebuilt textures are out of date (python -m game.asset_pipeline); using PNGs")
+            return None
+    return manifest
+
+
+def pick_variant(target_height, manifest):
+    # smallest built height at least target_height (else the largest); None = the PNGs
+    if manifest is None:
+        return None
+    heights = sorted(manifest["heights"])
+    if target_height:
+        for height in heights:
+            if height >= target_height:
+                return height
+    return heights[-1]
+
+
+def read_texture_data(entry, folder=TEXTURE_DIR):
+    # pipeline file -> raw pixel bytes; no GL calls, so safe on a worker thread
+    with open(os.path.join(folder, entry["file"]), "rb") as f:
+        data = f.read()
+    if entry["compression"] == "zlib":
+        data = zlib.decompress(data)
+    return data
+
+
+# Pixels read from a pipeline texture file. Like the images ImageLoader returns,
+# the GPU texture is created on first .texture access, which must be on the main thread.
+class PackedImage:
+    def __init__(self, entry, pixels):
+        self.entry = entry
+        self.pixels = pixels
+        self._texture = None
+
+    @property
+    def texture(self):
+        if self._texture is None:
+            entry = self.entry
+            texture = Texture.create(size=(entry["width"], entry["height"]), colorfmt=entry["format"])
+            texture.blit_buffer(self.pixels, colorfmt=entry["format"], bufferfmt="ubyte")
+            self._texture = texture
+            self.pixels = None
+        return self._texture
+
+
+def texture_bytes(texture):
+    return texture.width * texture.height * (3 if texture.colorfmt == "rgb" else 4)
+
+
+# Textures the renderer needs, decoded and uploaded once at startup so switching
+# theme or obstacle sprite only swaps texture handles on the Rectangles.
+class AssetCache:
+    def __init__(self, background_budget=BACKGROUND_BUDGET_BYTES, packed=True):
+        self.background_budget = background_budget
+        self.manifest = load_manifest() if packed else None
+        self.variant = pick_variant(None, self.manifest)  # texture height in use (None = PNGs)
+        self.obstacle_textures = []
+        self._backgrounds = OrderedDict()  # theme -> Texture, least recently used first
+        self._background_bytes = 0
+
+    def load(self):
+        self._load_obstacles()
+        for theme in range(len(BACKGROUND_IMAGES)):
+            self.background_texture(theme)
+        return self
+
+    def _load_obstacles(self):
+        if self.manifest is not None:
+            # one pre-scaled sheet per height, cut into per-theme regions
+            entry = self.manifest["textures"][f"obstacles@{self.variant}"]
+            sheet = PackedImage(entry, read_texture_data(entry)).texture
+            self.obstacle_textures = [sheet.get_region(*region) for region in entry["regions"]]
+            return
+        atlas_file = build_obstacle_atlas()
+        if atlas_file:
+            from kivy.atlas import Atlas
+            atlas = Atlas(atlas_file)
+            names = [os.path.splitext(os.path.basename(path))[0] for path in OBSTACLE_IMAGES]
+            self.obstacle_textures = [atlas[name] for name in names]
+        else:
+            self.obstacle_textures = [CoreImage(path).texture for path in OBSTACLE_IMAGES]
+
+    def set_target_height(self, height):
+        # pick the texture height for a game drawn `height` pixels tall; on a change the
+        # obstacle sheet is swapped and the resident backgrounds are dropped, to be reloaded
+        # (or prefetched) at the new size. Returns True if the variant changed.
+        variant = pick_variant(height, self.manifest)
+        if variant == self.variant:
+            return False
+        self.variant = variant
+        self._backgrounds.clear()
+        self._background_bytes = 0
+        if self.obstacle_textures:
+            self._load_obstacles()
+        return True
+
+    def background_key(self, theme):
+        # identifies the file a background is loaded from at the current variant
+        return theme, self.variant
+
+    def decode_background(self, key):
+        # read/decode only (worker-thread safe); the result's .texture does the upload
+        theme, variant = key
+        if variant is None:
+            return ImageLoader.load(BACKGROUND_IMAGES[theme], nocache=True)
+        entry = self.manifest["textures"][f"background-{theme}@{variant}"]
+        return PackedImage(entry, read_texture_data(entry))
+
+    def obstacle_texture(self, theme):
+        return self.obstacle_textures[theme]
+
+    def has_background(self, theme):
+        return theme in self._backgrounds
+
+    def peek_background(self, theme):
+        # resident texture or None; never decodes (safe to call from update)
+        texture = self._backgrounds.get(theme)
+        if texture is not None:
+            self._backgrounds.move_to_end(theme)
+        return texture
+
+    def background_texture(self, theme):
+        texture = self.peek_background(theme)
+        if texture is not None:
+            return texture
+        # miss (evicted under the budget): decode now
+        texture = self.decode_background(self.background_key(theme)).texture
+        self.put_background(theme, texture)
+        return texture
+
+    def put_background(self, theme, texture):
+        old = self._backgrounds.pop(theme, None)
+        if old is not None:
+            self._background_bytes -= texture_bytes(old)
+        self._backgrounds[theme] = texture
+        self._background_bytes += texture_bytes(texture)
+        self._evict(keep=theme)
+
+    def _evict(self, keep):
+        if self.background_budget is None:
+            return
+        for theme in list(self._backgrounds):
+            if self._background_bytes <= self.background_budget:
+                break
+            if theme == keep:
+                continue
+            self._background_bytes -= texture_bytes(self._backgrounds.pop(theme))
+
+
+_cache = None
+
+
+def get_cache(target_height=None):
+    # shared cache, loaded on first use (the startup asset stage) at the variant
+    # for target_height
+    global _cache
+    if _cache is None:
+        _cache = AssetCache()
+        _cache.set_target_height(target_height)
+        _cache.load()
+    return _cache
+
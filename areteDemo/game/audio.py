@@ -0,0 +1,155 @@
+import os
+import time
+from collections import deque
+
+from game.profiler import summarize
+
+SOUND_DIR = "sounds"
+SOUND_EXTENSIONS = (".wav", ".ogg")  # first match wins; wav has no decode cost at load either
+# clip name (sounds/<name>.wav) -> voices loaded for it, i.e. how many copies can overlap
+CLIPS = {
+    "jump": 2,
+    "hit": 2,
+    "theme_switch": 1,
+    "countdown": 1,
+    "game_over": 1,
+}
+MAX_VOICES = 6  # sounds playing at once; past this the oldest one is cut off
+DEFAULT_CLIP_SECONDS = 0.5  # assumed length when the audio provider can't tell
+LATENCY_WINDOW = 200  # triggers kept for the latency percentiles
+
+# GameWidget event -> clip played for it
+GAME_EVENT_CLIPS = {
+    "on_jump": "jump",
+    "on_hit": "hit",
+    "on_theme_switch": "theme_switch",
+    "on_countdown": "countdown",
+    "on_game_end": "game_over",
+}
+
+
+class Voice:
+    def __init__(self, sound, clip):
+        self.sound = sound
+        self.clip = clip
+        self.length = sound.length or DEFAULT_CLIP_SECONDS
+        self.busy_until = 0.0
+
+
+# Sound effects without disk I/O or decoding during play. load() creates every
+# voice up front (SoundLoader decodes the whole clip into memory with the SDL2
+# provider), and play() only picks a voice and starts it: a free voice of that
+# clip if there is one, else the clip's voice that started first. If MAX_VOICES
+# are already sounding, the oldest one is stopped first (voice stealing).
+# Missing clips or no audio provider just mean silence. Kivy is only needed by
+# load(), so the voice logic runs (and is tested) with stand-in sounds.
+#
+# latency keeps trigger -> play() returned, in ms: the game event's timestamp to
+# the sound being handed to the mixer (the mixer's own buffer comes on top).
+class AudioEngine:
+    def __init__(self, folder=SOUND_DIR, clips=CLIPS, max_voices=MAX_VOICES, volume=1.0,
+                 clock=time.perf_counter):
+        self.folder = folder
+        self.clips = dict(clips)
+        self.max_voices = max_voices
+        self.volume = volume
+        self.clock = clock
+        self.voices = {}  # clip -> [Voice]
+        self.missing = []
+        self.latency = deque(maxlen=LATENCY_WINDOW)
+        self.played = 0
+        self.stolen = 0
+        self._playing = deque()  # voices in the order they started
+
+    def _find(self, clip):
+        for ext in SOUND_EXTENSIONS:
+            path = os.path.join(self.folder, clip + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def load(self):
+        from kivy.core.audio import SoundLoader
+        from kivy.logger import Logger
+
+        for clip, count in self.clips.items():
+            path = self._find(clip)
+            voices = []
+            for _ in range(count if path else 0):
+                sound = SoundLoader.load(path)
+                if sound is None:
+                    break
+                sound.volume = self.volume
+                voices.append(Voice(sound, clip))
+            if voices:
+                self.voices[clip] = voices
+            else:
+                self.missing.append(clip)
+        if self.missing:
+            Logger.info(f"Audio: no sound for {', '.join(self.missing)} (looked in {self.folder}/)")
+        return self
+
+    def attach(self, widget, events=GAME_EVENT_CLIPS):
+        # play clips on the widget's game events; handlers get (widget, timestamp).
+        # Kivy's bind() silently ignores on_* names the widget doesn't dispatch.
+        for event, clip in events.items():
+            if not widget.is_event_type(event):
+                raise ValueError(f"{type(widget).__name__} has no {event} event")
+            if clip in self.voices:
+                widget.bind(**{event: self._handler(clip)})
+
+    def _handler(self, clip):
+        return lambda widget, timestamp: self.play(clip, timestamp)
+
+    def play(self, clip, timestamp=None):
+        voices = self.voices.get(clip)
+        if not voices:
+            return False
+        now = self.clock()
+        # drop every voice that has finished, not just those at the front: voices of
+        # different clips end in a different order than they started
+        playing = self._playing
+        if any(v.busy_until <= now for v in playing):
+            playing = self._playing = deque(v for v in playing if v.busy_until > now)
+
+        # the clip's free voice, or its oldest one
+        voice = voices[0]
+        for candidate in voices:
+            if candidate.busy_until < voice.busy_until:
+                voice = candidate
+        if voice.busy_until > now:
+            playing.remove(voice)
+            voice.sound.stop()
+            self.stolen += 1
+        elif len(playing) >= self.max_voices:
+            oldest = playing.popleft()
+            oldest.sound.stop()
+            oldest.busy_until = 0.0
+            self.stolen += 1
+
+        voice.sound.play()
+        voice.busy_until = now + voice.length
+        playing.append(voice)
+        self.played += 1
+        self.latency.append((self.clock() - (now if timestamp is None else timestamp)) * 1000.0)
+        return True
+
+    def stop_all(self):
+        for voice in self._playing:
+            voice.sound.stop()
+            voice.busy_until = 0.0
+        self._playing.clear()
+
+    @property
+    def last_latency_ms(self):
+        return self.latency[-1] if self.latency else 0.0
+
+    def summary(self):
+        return summarize(self.latency)
+
+    def unload(self):
+        self.stop_all()
+        for voices in self.voices.values():
+            for voice in voices:
+                voice.sound.unload()
+        self.voices.clear()
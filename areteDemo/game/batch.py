@@ -0,0 +1,298 @@
+# NumPy batch simulator for difficulty tuning: steps N independent games in
+# lockstep with array operations (physics, spawning, AABB-circle collision,
+# expiry), following the same rules and step order as GameSimulation.
+# Obstacles live in (N, capacity) arrays with an `alive` mask, widened if a
+# configuration needs more. Jumps follow GameSimulation's input model:
+# step(jump=mask) jumps where possible, request_jump(mask) also buffers presses
+# for JUMP_BUFFER_SECONDS. The random numbers come from NumPy rather than
+# random.Random, so single sessions differ from GameSimulation with the same
+# seed, but score distributions match; MatchedRandom reproduces GameSimulation's
+# obstacle stream exactly (slowly) for parity checks.
+#
+# Sweep a grid of tuning constants across cores and print the score
+# distribution for each configuration:
+#   python -m game.batch --instances 2000 --grid GRAVITY=-1000,-1200,-1400 --grid JUMP_VELOCITY=650,700,750
+import argparse
+import itertools
+import random
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from game.constants import (
+    WINDOW_WIDTH, FLOOR_HEIGHT, PLAYER_X, PLAYER_RADIUS, GRAVITY, JUMP_VELOCITY, JUMP_BUFFER_SECONDS, INITIAL_SPEED,
+    MIN_SPEED, SPEED_INCREASE_PER_5_AVOIDED, OBSTACLE_MIN_SIZE, OBSTACLE_MAX_SIZE, OBSTACLE_SPAWN_JITTER,
+    SPAWN_INTERVAL_BASE, SLOW_ON_HIT_MULTIPLIER, GAME_DURATION, SIM_DT,
+)
+from game.headless import JUMP_LEAD_SECONDS
+
+# tunable constants, by their game/constants.py names
+DEFAULT_PARAMS = {
+    "GRAVITY": GRAVITY,
+    "JUMP_VELOCITY": JUMP_VELOCITY,
+    "INITIAL_SPEED": INITIAL_SPEED,
+    "MIN_SPEED": MIN_SPEED,
+    "SPEED_INCREASE_PER_5_AVOIDED": SPEED_INCREASE_PER_5_AVOIDED,
+    "SLOW_ON_HIT_MULTIPLIER": SLOW_ON_HIT_MULTIPLIER,
+    "SPAWN_INTERVAL_BASE": SPAWN_INTERVAL_BASE,
+}
+OBSTACLE_CAPACITY = 8  # initial live obstacles per game (grows if needed); ~6 at the default settings
+SCORE_PERCENTILES = (10, 50, 90)
+
+
+# Stands in for the NumPy generator with one random.Random per game, drawing
+# obstacles in the same order as GameSimulation.spawn_obstacle: game i with
+# seeds[i] then meets the same obstacles as GameSimulation(seed=seeds[i]).
+class MatchedRandom:
+    def __init__(self, seeds):
+        self.games = [random.Random(seed) for seed in seeds]
+
+    def integers(self, low, high, size, endpoint=True):
+        return np.array([game.randint(low, high) for game in self.games])
+
+
+class BatchSimulation:
+    def __init__(self, instances, seed=0, params=None, dt=SIM_DT, duration=GAME_DURATION,
+                 capacity=OBSTACLE_CAPACITY, rng=None):
+        self.n = instances
+        self.dt = dt
+        self.duration = duration
+        self.params = dict(DEFAULT_PARAMS, **(params or {}))
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+
+        self.frame = 0
+        self.elapsed = 0.0
+        self.game_over = False
+        self._spawn_accumulator = 0.0
+
+        n = instances
+        self.speed = np.full(n, float(self.params["INITIAL_SPEED"]))
+        self.player_y = np.full(n, float(FLOOR_HEIGHT + PLAYER_RADIUS))
+        self.player_vy = np.zeros(n)
+        self.jump_buffer = np.zeros(n)  # seconds a requested jump stays pending
+        self.score_distance = np.zeros(n)
+        self.avoided_count = np.zeros(n, dtype=np.int64)
+        self.hit_count = np.zeros(n, dtype=np.int64)
+        self._last_speed_milestone = np.zeros(n, dtype=np.int64)
+
+        self.obstacle_x = np.zeros((n, capacity))  # screen x (left edge)
+        self.obstacle_size = np.zeros((n, capacity))
+        self.alive = np.zeros((n, capacity), dtype=bool)
+        self._rows = np.arange(n)
+
+    @property
+    def final_score(self):
+        return self.score_distance.astype(np.int64) + self.avoided_count * 100
+
+    def on_ground(self):
+        return (np.abs(self.player_y - (FLOOR_HEIGHT + PLAYER_RADIUS)) < 1.0) & (self.player_vy <= 0.0)
+
+    def jump(self, mask):
+        # returns which games jumped
+        mask = mask & self.on_ground()
+        self.player_vy[mask] = self.params["JUMP_VELOCITY"]
+        self.jump_buffer[mask] = 0.0
+        return mask
+
+    def request_jump(self, mask):
+        # GameSimulation.request_jump for each game in mask
+        jumped = self.jump(mask)
+        self.jump_buffer[mask & ~jumped] = JUMP_BUFFER_SECONDS
+        return jumped
+
+    def step(self, jump=None):
+        if self.game_over:
+            return
+        dt = self.dt
+        params = self.params
+        # games told to jump try now; the others retry a buffered request
+        buffered = self.jump_buffer > 0.0
+        if jump is not None:
+            self.jump(jump)
+            buffered &= ~jump
+        if buffered.any():
+            waiting = buffered & ~self.jump(buffered)
+            self.jump_buffer[waiting] = np.maximum(0.0, self.jump_buffer[waiting] - dt)
+
+        self.frame += 1
+        self.elapsed += dt
+        if self.elapsed >= self.duration:
+            self.game_over = True
+            return
+
+        self.obstacle_x -= (self.speed * dt)[:, None]
+
+        # every game spawns on the same tick; the first free column takes the obstacle
+        self._spawn_accumulator += dt
+        if self._spawn_accumulator >= max(0.4, params["SPAWN_INTERVAL_BASE"]):
+            self._spawn_accumulator = 0.0
+            free = ~self.alive
+            if not free.any(axis=1).all():
+                self._grow()
+                free = ~self.alive
+            col = free.argmax(axis=1)
+            rows = self._rows
+            self.obstacle_size[rows, col] = self.rng.integers(OBSTACLE_MIN_SIZE, OBSTACLE_MAX_SIZE, self.n, endpoint=True)
+            self.obstacle_x[rows, col] = WINDOW_WIDTH + self.rng.integers(0, OBSTACLE_SPAWN_JITTER, self.n, endpoint=True)
+            self.alive[rows, col] = True
+
+        self.player_vy += params["GRAVITY"] * dt
+        self.player_y += self.player_vy * dt
+        grounded = self.player_y < FLOOR_HEIGHT + PLAYER_RADIUS
+        self.player_y[grounded] = FLOOR_HEIGHT + PLAYER_RADIUS
+        self.player_vy[grounded] = 0.0
+
+        milestone = self.avoided_count // 5
+        raised = milestone > self._last_speed_milestone
+        self._last_speed_milestone = np.maximum(milestone, self._last_speed_milestone)
+        self.speed[raised] += params["SPEED_INCREASE_PER_5_AVOIDED"]
+
+        self.score_distance += self.speed * dt
+
+        self._collide()
+        self._expire_passed()
+
+    def _grow(self):
+        # double the obstacle columns (slow speed / dense spawn configurations)
+        pad = self.alive.shape[1]
+        self.obstacle_x = np.pad(self.obstacle_x, ((0, 0), (0, pad)))
+        self.obstacle_size = np.pad(self.obstacle_size, ((0, 0), (0, pad)))
+        self.alive = np.pad(self.alive, ((0, 0), (0, pad)))
+
+    def _collide(self):
+        # broad phase: live obstacles overlapping the player's x-window (a few per step
+        # across the whole batch), then the AABB-circle test on just those. Like
+        # GameSimulation, at most one hit per game per step, the leftmost.
+        x, size = self.obstacle_x, self.obstacle_size
+        near = self.alive & (x <= PLAYER_X + PLAYER_RADIUS) & (x + size >= PLAYER_X - PLAYER_RADIUS)
+        rows, cols = np.nonzero(near)
+        if not rows.size:
+            return
+        ox = x[rows, cols]
+        osize = size[rows, cols]
+        cy = self.player_y[rows]
+        dx = PLAYER_X - np.minimum(np.maximum(PLAYER_X, ox), ox + osize)
+        dy = cy - np.minimum(np.maximum(cy, FLOOR_HEIGHT), FLOOR_HEIGHT + osize)
+        hit = dx * dx + dy * dy <= PLAYER_RADIUS * PLAYER_RADIUS
+        if not hit.any():
+            return
+        rows, cols, ox = rows[hit], cols[hit], ox[hit]
+        order = np.lexsort((ox, rows))
+        rows, cols = rows[order], cols[order]
+        first = np.ones(rows.size, dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+        rows, cols = rows[first], cols[first]
+        self.alive[rows, cols] = False
+        self.hit_count[rows] += 1
+        self.speed[rows] = np.maximum(self.params["MIN_SPEED"],
+                                      self.speed[rows] * self.params["SLOW_ON_HIT_MULTIPLIER"])
+
+    def _expire_passed(self):
+        passed = self.alive & (self.obstacle_x + self.obstacle_size < 0)
+        self.avoided_count += passed.sum(axis=1)
+        self.alive &= ~passed
+
+    def results(self):
+        return {
+            "score": self.final_score,
+            "distance": self.score_distance.astype(np.int64),
+            "avoided": self.avoided_count.copy(),
+            "hits": self.hit_count.copy(),
+        }
+
+
+# Policies take the batch and return a bool array: which games press jump this step.
+def heuristic_policy(batch):
+    # vectorized game.headless.heuristic_policy: jump when the nearest obstacle
+    # not yet passed is within JUMP_LEAD_SECONDS of the player's front
+    ahead = batch.alive & (batch.obstacle_x + batch.obstacle_size >= PLAYER_X)
+    nearest = np.where(ahead, batch.obstacle_x, np.inf).min(axis=1)
+    return batch.on_ground() & (nearest - (PLAYER_X + PLAYER_RADIUS) <= JUMP_LEAD_SECONDS * batch.speed)
+
+
+def scripted_policy(frames):
+    # every game jumps at the given frame indexes
+    frames = set(frames)
+
+    def policy(batch):
+        return np.full(batch.n, batch.frame in frames)
+    return policy
+
+
+def run_batch(instances, seed=0, params=None, policy=heuristic_policy, duration=GAME_DURATION, dt=SIM_DT):
+    batch = BatchSimulation(instances, seed, params, dt, duration)
+    while not batch.game_over:
+        batch.step(jump=policy(batch))
+    return batch.results()
+
+
+def summarize(results):
+    scores = results["score"]
+    summary = {"mean": float(scores.mean()), "std": float(scores.std()),
+               "min": int(scores.min()), "max": int(scores.max())}
+    for p, value in zip(SCORE_PERCENTILES, np.percentile(scores, SCORE_PERCENTILES)):
+        summary[f"p{p}"] = float(value)
+    summary["hits"] = float(results["hits"].mean())
+    summary["avoided"] = float(results["avoided"].mean())
+    return summary
+
+
+def _run_config(job):
+    params, instances, seed, duration, dt = job
+    return params, summarize(run_batch(instances, seed, params, duration=duration, dt=dt))
+
+
+def sweep(grid, instances=1000, seed=0, processes=None, duration=GAME_DURATION, dt=SIM_DT):
+    # grid: {param name: [values]}; one batch per combination, spread over a process pool.
+    # Every configuration gets the same seed so they face the same obstacle stream.
+    unknown = set(grid) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"unknown parameters: {', '.join(sorted(unknown))}")
+    names = list(grid)
+    jobs = [(dict(zip(names, values)), instances, seed, duration, dt)
+            for values in itertools.product(*(grid[name] for name in names))]
+    if processes == 1 or len(jobs) == 1:
+        return [_run_config(job) for job in jobs]
+    with Pool(processes) as pool:
+        return pool.map(_run_config, jobs)
+
+
+def _parse_grid(items):
+    grid = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        grid[name.strip().upper()] = [float(value) for value in values.split(",")]
+    return grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep tuning constants with the NumPy batch simulator.")
+    parser.add_argument("--instances", type=int, default=1000, help="games per configuration")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=v1,v2,...",
+                        help=f"values to sweep; names: {', '.join(DEFAULT_PARAMS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=GAME_DURATION, help="seconds of game time per session")
+    parser.add_argument("--dt", type=float, default=SIM_DT, help="fixed timestep in seconds")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    grid = _parse_grid(args.grid)
+    t0 = time.perf_counter()
+    rows = sweep(grid, args.instances, args.seed, args.processes, args.duration, args.dt)
+    elapsed = time.perf_counter() - t0
+
+    names = list(grid)
+    header = "".join(f"{name[:14]:>15}" for name in names)
+    print(f"{header}{'mean':>9}{'std':>8}" + "".join(f"{f'p{p}':>8}" for p in SCORE_PERCENTILES)
+          + f"{'hits':>7}{'avoided':>9}")
+    for params, s in rows:
+        values = "".join(f"{params[name]:>15g}" for name in names)
+        print(f"{values}{s['mean']:>9.0f}{s['std']:>8.0f}" + "".join(f"{s[f'p{p}']:>8.0f}" for p in SCORE_PERCENTILES)
+              + f"{s['hits']:>7.1f}{s['avoided']:>9.1f}")
+    sessions = len(rows) * args.instances
+    print(f"{len(rows)} configurations x {args.instances} games in {elapsed:.1f}s ({sessions / elapsed:,.0f} sessions/s)")
+
+
+if __name__ == "__main__":
+    main()
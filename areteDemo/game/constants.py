@@ -0,0 +1,38 @@
+# Game constants (shared by the Kivy GameWidget and the headless simulation)
+WINDOW_WIDTH = 1920
+WINDOW_HEIGHT = 1080
+FLOOR_HEIGHT = 150
+
+# BASE_FLOOR_RATIO = 0.15
+
+PLAYER_X = 400.0  # horizontal position of player (constant)  # change this number only
+PLAYER_RADIUS = 30
+GRAVITY = -1200  # pixels per second^2 (negative = pulls down)
+JUMP_VELOCITY = 700  # initial jump velocity - tuned for feel
+JUMP_BUFFER_SECONDS = 0.1  # a jump pressed this long before landing still happens on landing
+
+INITIAL_SPEED = 240  # pixels/second (how fast obstacles move left)
+MIN_SPEED = 200  # don't let hits slow the world below this
+SPEED_INCREASE_PER_5_AVOIDED = 10  # speed increases incrementally for every 5 obstacles avoided
+OBSTACLE_MIN_GAP = 350
+OBSTACLE_MAX_GAP = 900
+OBSTACLE_MIN_SIZE = 70
+OBSTACLE_MAX_SIZE = 100
+OBSTACLE_SPAWN_JITTER = 120  # obstacles spawn up to this many px right of the window edge
+SPAWN_INTERVAL_BASE = 2.0  # base interval between obstacles (sec) - modified by speed
+
+SLOW_ON_HIT_MULTIPLIER = 0.9  # speed multiplier upon hit
+GAME_DURATION = 300  # 5 minute game duration
+
+THEME_COUNT = 5  # sea, forest, desert, sky, space
+BG_SWITCH_SECONDS = 20.0  # background (theme) switch interval
+
+#SPAWN_PAUSE_ON_BG_SWITCH = 2.0  # pause obstacle spawning after background switches (sec)
+OBSTACLE_PREVIEW_SECONDS = 5.5  # spawn NEXT theme obstacles this many seconds before bg switch
+
+# Physics runs at a fixed rate independent of the render rate; the renderer
+# interpolates between the last two physics states.
+PHYSICS_HZ = 120
+SIM_DT = 1.0 / PHYSICS_HZ  # fixed simulation timestep (live game and headless)
+MAX_SUBSTEPS = 8  # physics steps per rendered frame at most; longer stalls drop time
+RENDER_FPS = 60  # GameWidget redraw rate; 0 = every display frame, lower saves battery
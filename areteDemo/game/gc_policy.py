@@ -0,0 +1,74 @@
+import gc
+import time
+
+# What the cyclic garbage collector does while a game is running (ARETE_GC):
+#   default - leave gc alone
+#   freeze  - collect once, then gc.freeze() everything alive at game start (assets,
+#             screens, Kivy) so collections during play only scan objects made since
+#   tuned   - freeze, plus a much higher gen-0 threshold so collections are rare
+#   off     - freeze and gc.disable() until the game ends (play allocates no cycles)
+# Reference counting frees everything acyclic in every mode; on game end the
+# normal settings come back.
+GC_MODES = ("default", "freeze", "tuned", "off")
+TUNED_THRESHOLD = (50000, 20, 100)
+
+
+class GcPolicy:
+    def __init__(self, mode="default"):
+        if mode not in GC_MODES:
+            raise ValueError(f"unknown gc mode {mode!r}, expected one of {GC_MODES}")
+        self.mode = mode
+        self.playing = False
+        self._threshold = None
+        self._was_enabled = True
+
+    def begin_play(self):
+        if self.playing or self.mode == "default":
+            return
+        self.playing = True
+        self._threshold = gc.get_threshold()
+        self._was_enabled = gc.isenabled()
+        gc.collect()
+        gc.freeze()
+        if self.mode == "tuned":
+            gc.set_threshold(*TUNED_THRESHOLD)
+        elif self.mode == "off":
+            gc.disable()
+
+    def end_play(self):
+        if not self.playing:
+            return
+        self.playing = False
+        gc.unfreeze()
+        gc.set_threshold(*self._threshold)
+        if self._was_enabled:
+            gc.enable()
+
+
+# Counts collections per generation and the longest pause, through gc.callbacks.
+class GcMonitor:
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.collected = 0
+        self.max_pause_ms = 0.0
+        self._start = None
+        gc.callbacks.append(self._callback)
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+        self.collections[info["generation"]] += 1
+        self.collected += info["collected"]
+        if self._start is not None:
+            self.max_pause_ms = max(self.max_pause_ms, (time.perf_counter() - self._start) * 1000.0)
+            self._start = None
+
+    def reset(self):
+        self.collections = [0, 0, 0]
+        self.collected = 0
+        self.max_pause_ms = 0.0
+
+    def close(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
@@ -0,0 +1,87 @@
+# Headless runner for GameSimulation: plays whole sessions without a window or
+# real time, for balance tuning and regression checks.
+#
+#   python -m game.headless --sessions 1000 --processes 8
+import argparse
+import statistics
+import time
+from multiprocessing import Pool
+
+from game.constants import GAME_DURATION, SIM_DT
+from game.simulation import GameSimulation
+
+JUMP_LEAD_SECONDS = 0.25  # how long before an obstacle reaches the player the heuristic jumps
+
+
+# Simple "decent player": jump when the next obstacle gets close.
+def heuristic_policy(sim):
+    if not sim.on_ground():
+        return False
+    front = sim.player_x + sim.player_radius
+    store = sim.obstacles
+    for slot in store:
+        if store.right(slot) < sim.player_x:
+            continue
+        return store.x(slot) - front <= JUMP_LEAD_SECONDS * sim.speed
+    return False
+
+
+def run_session(seed, inputs=None, policy=heuristic_policy, duration=GAME_DURATION, dt=SIM_DT):
+    # inputs: frame indexes (0-based step number) at which SPACE is pressed.
+    # When given, the input script is used instead of the policy.
+    sim = GameSimulation(seed=seed, dt=dt, duration=duration)
+    if inputs is not None:
+        inputs = set(inputs)
+    while not sim.game_over:
+        if inputs is not None:
+            jump = sim.frame in inputs
+        else:
+            jump = policy is not None and policy(sim)
+        sim.step(jump=jump)
+    return {
+        "seed": seed,
+        "score": sim.final_score,
+        "distance": int(sim.score_distance),
+        "avoided": sim.avoided_count,
+        "hits": sim.hit_count,
+        "frames": sim.frame,
+    }
+
+
+def _run_seed(args):
+    seed, duration, dt = args
+    return run_session(seed, duration=duration, dt=dt)
+
+
+def run_batch(seeds, processes=None, duration=GAME_DURATION, dt=SIM_DT):
+    jobs = [(seed, duration, dt) for seed in seeds]
+    if processes == 1:
+        return [_run_seed(job) for job in jobs]
+    with Pool(processes) as pool:
+        return pool.map(_run_seed, jobs, chunksize=max(1, len(jobs) // 64))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run game sessions headless.")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="first seed; sessions use seed, seed+1, ...")
+    parser.add_argument("--duration", type=float, default=GAME_DURATION, help="seconds of game time per session")
+    parser.add_argument("--dt", type=float, default=SIM_DT, help="fixed timestep in seconds")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    results = run_batch(range(args.seed, args.seed + args.sessions), args.processes, args.duration, args.dt)
+    elapsed = time.perf_counter() - t0
+
+    scores = [r["score"] for r in results]
+    print(f"{len(results)} sessions of {args.duration:g}s in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} sessions/s, {sum(r['frames'] for r in results) / elapsed:,.0f} steps/s)")
+    print(f"score  mean={statistics.mean(scores):.0f}  median={statistics.median(scores):.0f}  "
+          f"min={min(scores)}  max={max(scores)}")
+    print(f"hits   mean={statistics.mean(r['hits'] for r in results):.1f}  "
+          f"avoided mean={statistics.mean(r['avoided'] for r in results):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, Rectangle
+from kivy.uix.widget import Widget
+
+HUD_UPDATE_HZ = 10  # the in-game counters redraw at most this often
+
+
+# Each character is rasterized once (white, tinted by the drawing Color) and
+# kept as a texture, so changing a number on screen is a texture-handle swap
+# instead of a text layout + re-raster of the whole string.
+class GlyphAtlas:
+    def __init__(self, font_size, bold=False, preload="0123456789"):
+        self.font_size = font_size
+        self.bold = bold
+        self._textures = {}
+        for char in preload:
+            self.texture(char)
+        self.line_height = self.texture("0").height
+
+    def texture(self, char):
+        texture = self._textures.get(char)
+        if texture is None:
+            label = CoreLabel(text=char, font_size=self.font_size, bold=self.bold)
+            label.refresh()
+            texture = self._textures[char] = label.texture
+        return texture
+
+
+# Text drawn from a GlyphAtlas with a fixed pool of Rectangles. Setting the same
+# text again is a no-op; otherwise only the glyphs that moved or changed are
+# touched. `text` can be assigned like a Label's. halign "center" centers each
+# line on x; lines are split on "\n" and go downwards from y.
+class GlyphText(Widget):
+    def __init__(self, atlas, max_chars=64, color=(0, 0, 0, 1), halign="left", **kwargs):
+        super().__init__(**kwargs)
+        self.atlas = atlas
+        self.halign = halign
+        self._text = ""
+        with self.canvas:
+            Color(*color)
+            self._rects = [Rectangle(size=(0, 0)) for _ in range(max_chars)]
+        self.bind(pos=lambda *_: self._layout(self._text))
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        if text != self._text:
+            self._text = text
+            self._layout(text)
+
+    def _layout(self, text):
+        atlas = self.atlas
+        rects = self._rects
+        i = 0
+        y = self.y
+        for line in text.split("\n"):
+            x = self.x
+            if self.halign == "center":
+                x -= sum(atlas.texture(char).width for char in line) / 2
+            for char in line:
+                if i >= len(rects):
+                    break
+                texture = atlas.texture(char)
+                rect = rects[i]
+                if rect.texture is not texture:
+                    rect.texture = texture
+                if rect.pos != (x, y):
+                    rect.pos = (x, y)
+                if rect.size != texture.size:
+                    rect.size = texture.size
+                x += texture.width
+                i += 1
+            y -= atlas.line_height
+        # hide the unused rectangles
+        for rect in rects[i:]:
+            if rect.size != (0, 0):
+                rect.size = (0, 0)
+
+
+# In-game "Distance / Avoided" readout: formats a new string only when the
+# displayed integers change, and at most HUD_UPDATE_HZ times a second.
+class HudCounter:
+    def __init__(self, glyph_text, rate_hz=HUD_UPDATE_HZ):
+        self.glyph_text = glyph_text
+        self.interval = 1.0 / rate_hz
+        self._since = self.interval  # first update draws straight away
+        self._shown = None
+
+    def reset(self):
+        self._since = self.interval
+        self._shown = None
+        self.glyph_text.text = ""
+
+    def update(self, dt, distance, avoided):
+        self._since += dt
+        if self._since < self.interval:
+            return
+        if self._shown == (distance, avoided):
+            return
+        self._since = 0.0
+        self._shown = (distance, avoided)
+        self.glyph_text.text = f"Distance: {distance}    Avoided: {avoided}"
+
+    def show(self, text):
+        # immediate, for one-off text like the final score
+        self._shown = None
+        self.glyph_text.text = text
@@ -0,0 +1,88 @@
+import time
+from collections import deque
+
+from game.profiler import summarize
+
+LATENCY_WINDOW = 200  # jumps kept for the latency percentiles
+
+JUMP = "jump"
+
+
+# Timestamped input for the fixed-step loop. Key handlers push() actions with the
+# wall-clock time they arrived (Kivy delivers key events between frames, so the
+# timestamp is taken in the handler). Each frame, map_to_sim() converts new
+# events to simulation time, using the sim time the frame is rendering at; the
+# update loop then takes each event with next_due() right before the first
+# physics step that starts at or after it, instead of all of them before the
+# frame's first step (too early) or at the next frame (too late).
+class InputQueue:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self._events = deque()  # [wall timestamp, action, sim time or None]
+
+    def __len__(self):
+        return len(self._events)
+
+    def clear(self):
+        self._events.clear()
+
+    def push(self, action, timestamp=None):
+        self._events.append([self.clock() if timestamp is None else timestamp, action, None])
+
+    def map_to_sim(self, now, render_time, earliest):
+        # render_time: sim time this frame shows at wall time `now` (after the
+        # frame's steps plus the leftover accumulator). Events older than the
+        # frame's first step (earliest) are applied at that step.
+        for event in self._events:
+            if event[2] is None:
+                event[2] = max(earliest, render_time - (now - event[0]))
+
+    def next_due(self, step_start):
+        # the oldest event at or before sim time step_start as (timestamp, action), else None
+        events = self._events
+        if events and events[0][2] is not None and events[0][2] <= step_start:
+            timestamp, action, _ = events.popleft()
+            return timestamp, action
+        return None
+
+
+# Input-to-render latency of jumps: from the key press to the end of the first
+# frame drawn after the jump took effect in the simulation (press(), then
+# jumped() from the step that did it, then presented() once that frame is on
+# its way to the screen). A buffered press counts from the press, so the time
+# spent waiting to land is included.
+class LatencyMonitor:
+    def __init__(self, window=LATENCY_WINDOW, clock=time.perf_counter):
+        self.clock = clock
+        self.samples = deque(maxlen=window)  # ms
+        self._press = None
+        self._pending = []
+
+    def reset(self):
+        self.samples.clear()
+        self._press = None
+        self._pending.clear()
+
+    def press(self, timestamp):
+        self._press = timestamp
+
+    def jumped(self):
+        if self._press is not None:
+            self._pending.append(self._press)
+            self._press = None
+
+    def presented(self, now=None):
+        if not self._pending:
+            return
+        if now is None:
+            now = self.clock()
+        for timestamp in self._pending:
+            self.samples.append((now - timestamp) * 1000.0)
+        self._pending.clear()
+
+    @property
+    def last_ms(self):
+        return self.samples[-1] if self.samples else 0.0
+
+    def summary(self):
+        return summarize(self.samples)
@@ -0,0 +1,50 @@
+from kivy.graphics import PushMatrix, PopMatrix, Scale, Translate
+
+from game.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+
+
+def fit(width, height, logical_width=WINDOW_WIDTH, logical_height=WINDOW_HEIGHT):
+    # uniform scale that fits the logical area into width x height, and the
+    # offset that centers it (letterbox / pillarbox)
+    if width <= 0 or height <= 0:
+        return 1.0, 0.0, 0.0
+    scale = min(width / logical_width, height / logical_height)
+    return scale, (width - logical_width * scale) / 2, (height - logical_height * scale) / 2
+
+
+# Everything in the game (simulation, renderer, HUD) works in logical
+# WINDOW_WIDTH x WINDOW_HEIGHT coordinates. This wraps a widget's whole canvas
+# (canvas.before, the children, canvas.after) in one Translate + Scale that maps
+# them onto the widget's actual size, updated when the widget moves or resizes.
+# on_resize(scale) is called after each later change, e.g. to pick texture variants.
+class LogicalViewport:
+    def __init__(self, widget, on_resize=None):
+        self.widget = widget
+        self.on_resize = on_resize
+        self.scale = 1.0
+        self.offset = (0.0, 0.0)
+        with widget.canvas.before:
+            PushMatrix()
+            self._translate = Translate()
+            self._scale = Scale(1, 1, 1)
+        with widget.canvas.after:
+            PopMatrix()
+        widget.bind(pos=self.update, size=self.update)
+        self._apply()
+
+    def update(self, *_):
+        self._apply()
+        if self.on_resize is not None:
+            self.on_resize(self.scale)
+
+    def _apply(self):
+        widget = self.widget
+        scale, dx, dy = fit(widget.width, widget.height)
+        self.scale = scale
+        self.offset = (widget.x + dx, widget.y + dy)
+        self._translate.xy = self.offset
+        self._scale.xyz = (scale, scale, 1)
+
+    def to_logical(self, x, y):
+        # window coordinates -> logical game coordinates
+        return (x - self.offset[0]) / self.scale, (y - self.offset[1]) / self.scale
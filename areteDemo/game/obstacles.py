@@ -0,0 +1,102 @@
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+from game.pool import Pool
+
+REBASE_OFFSET = 1e6  # fold the scroll offset back into the stored x's past this
+
+
+# Struct-of-arrays obstacle store. Each obstacle is a slot index into flat arrays;
+# slots come from a Pool, so freed ones are reused by the next spawn and the
+# arrays stop growing once the peak number of live obstacles has been reached.
+#
+# Every obstacle moves left at the same world speed, so x is stored in world
+# coordinates and the store keeps one scroll offset: screen x = world_x - offset.
+# Moving all obstacles left by speed*dt is then a single `scroll(speed * dt)`.
+#
+# Live slots are kept in `order`, sorted by x (left edge), so callers can cull by
+# x-window with bisect and expire from the left.
+class ObstacleStore:
+    def __init__(self):
+        self.world_x = array('d')
+        self.y = array('f')
+        self.size = array('f')
+        self.theme = array('B')
+        self.offset = 0.0
+        self.order = deque()
+        self.slots = Pool(self._new_slot)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        # live slots, left to right
+        return iter(self.order)
+
+    def clear(self):
+        for slot in self.order:
+            self.slots.release(slot)
+        self.order.clear()
+        self.offset = 0.0
+
+    @property
+    def capacity(self):
+        return len(self.world_x)
+
+    def x(self, slot):
+        return self.world_x[slot] - self.offset
+
+    def right(self, slot):
+        return self.world_x[slot] - self.offset + self.size[slot]
+
+    def _new_slot(self):
+        # grow every array by one entry; the slot is its index
+        slot = len(self.world_x)
+        self.world_x.append(0.0)
+        self.y.append(0.0)
+        self.size.append(0.0)
+        self.theme.append(0)
+        return slot
+
+    def spawn(self, x, y, size, theme):
+        wx = x + self.offset
+        slot = self.slots.acquire()
+        self.world_x[slot] = wx
+        self.y[slot] = y
+        self.size[slot] = size
+        self.theme[slot] = theme
+
+        order = self.order
+        if not order or self.world_x[order[-1]] <= wx:
+            order.append(slot)
+        else:
+            # spawn jitter can put a new obstacle left of the previous one when
+            # spawns are dense; keep the order
+            order.insert(self.bisect(x), slot)
+        return slot
+
+    def scroll(self, dx):
+        self.offset += dx
+        if self.offset > REBASE_OFFSET:
+            offset = self.offset
+            world_x = self.world_x
+            for slot in self.order:
+                world_x[slot] -= offset
+            self.offset = 0.0
+
+    def bisect(self, x):
+        # index in `order` of the first obstacle whose left edge is >= screen x
+        world_x = self.world_x
+        return bisect_left(self.order, x + self.offset, key=world_x.__getitem__)
+
+    def remove_at(self, index):
+        slot = self.order[index]
+        del self.order[index]
+        self.slots.release(slot)
+        return slot
+
+    def popleft(self):
+        slot = self.order.popleft()
+        self.slots.release(slot)
+        return slot
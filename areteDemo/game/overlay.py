@@ -0,0 +1,32 @@
+from kivy.uix.label import Label
+
+OVERLAY_REFRESH_SECONDS = 0.25  # re-render the overlay text at most this often
+
+
+# On-screen readout of a FrameProfiler, toggled in game (F3). Refreshing it
+# re-rasterizes a Label, so it only does that a few times a second.
+class ProfilerOverlay(Label):
+    def __init__(self, profiler, **kwargs):
+        kwargs.setdefault("font_size", 16)
+        kwargs.setdefault("color", (1, 1, 0, 1))
+        kwargs.setdefault("halign", "left")
+        kwargs.setdefault("valign", "top")
+        super().__init__(**kwargs)
+        self.text_size = self.size
+        self.profiler = profiler
+        self._since_refresh = 0.0
+        self.opacity = 1 if profiler.enabled else 0
+
+    def toggle(self):
+        self.profiler.enabled = not self.profiler.enabled
+        self.profiler.reset()
+        self.opacity = 1 if self.profiler.enabled else 0
+        self.text = ""
+
+    def refresh(self, dt):
+        if not self.profiler.enabled:
+            return
+        self._since_refresh += dt
+        if self._since_refresh >= OVERLAY_REFRESH_SECONDS:
+            self._since_refresh = 0.0
+            self.text = self.profiler.report()
@@ -0,0 +1,151 @@
+from kivy.graphics import Color, InstructionGroup, Rectangle
+
+from game.constants import FLOOR_HEIGHT, WINDOW_HEIGHT
+
+# (scroll factor, bottom, top): each layer draws the band between bottom and top
+# (fractions of the height) of the theme's background, scrolled at factor times
+# the world speed. Later layers draw over earlier ones.
+PARALLAX_LAYERS = (
+    (0.15, 0.0, 1.0),  # the whole picture, far away
+    (1.0, 0.0, FLOOR_HEIGHT / WINDOW_HEIGHT),  # the ground, moving with the obstacles
+)
+CROSSFADE_SECONDS = 0.6
+# The prebuilt backgrounds (game/asset_pipeline.py) are power-of-two sized and tile
+# seamlessly, so plain repeat works everywhere. The PNG fallback is NPOT: it repeats
+# only where the GPU supports NPOT textures (GLES2 doesn't have to), else it stays put.
+BACKGROUND_WRAP = "repeat"
+STATIC_WRAP = "clamp_to_edge"
+
+_npot = None  # GL supports repeating NPOT textures; checked once a GL context exists
+
+
+def _can_repeat(texture):
+    global _npot
+    width, height = texture.size
+    if not width & (width - 1) and not height & (height - 1):
+        return True
+    if _npot is None:
+        from kivy.graphics.opengl_utils import gl_has_capability, GLCAP_NPOT
+        _npot = bool(gl_has_capability(GLCAP_NPOT))
+    return _npot
+
+
+# One theme's layers under a shared Color, so the whole set fades as one.
+class _Deck:
+    def __init__(self, layers, width, height):
+        self.group = InstructionGroup()
+        self.color = Color(1, 1, 1, 1)
+        self.group.add(self.color)
+        # (rect, scroll factor, bottom, top) per layer
+        self.layers = []
+        for factor, bottom, top in layers:
+            rect = Rectangle(pos=(0, height * bottom), size=(width, height * (top - bottom)))
+            self.group.add(rect)
+            self.layers.append((rect, factor, bottom, top))
+        self.texture = None
+        self.scrolls = False
+        self.u0 = self.du = self.v0 = self.dv = 0.0
+
+    def assign(self, texture):
+        self.texture = texture
+        self.scrolls = _can_repeat(texture)
+        wrap = BACKGROUND_WRAP if self.scrolls else STATIC_WRAP
+        if texture.wrap != wrap:
+            texture.wrap = wrap
+        # the texture's own coordinates (images loaded from PNG are flipped)
+        u0, v0, u1, _, _, v1, _, _ = texture.tex_coords
+        self.u0, self.du, self.v0, self.dv = u0, u1 - u0, v0, v1 - v0
+        for rect, _, _, _ in self.layers:
+            rect.texture = texture  # also resets tex_coords; scroll() sets them again
+
+
+# Scrolling background for GameRenderer. The instructions are fixed: two decks of
+# full-width rectangles (one per layer) that never move; scrolling only rewrites
+# their tex_coords (into one reused list), and the texture repeats past its edge.
+# Only the current deck is in the background's group (nothing before the first
+# texture). A theme change puts the new texture on the spare deck, adds it above
+# the current one and fades it in through its Color alpha; when the fade ends the
+# old deck is removed, so there is never a hidden deck being drawn.
+class ParallaxBackground:
+    def __init__(self, canvas, width, height, layers=PARALLAX_LAYERS, fade_seconds=CROSSFADE_SECONDS):
+        self.width = width
+        self.layers = layers
+        self.fade_seconds = fade_seconds
+        self._current = _Deck(layers, width, height)
+        self._other = _Deck(layers, width, height)
+        self.group = InstructionGroup()  # holds the visible deck(s), at the background's place
+        canvas.add(self.group)
+        self._fade = None  # 0..1 while cross-fading
+        self._distance = None
+        self._uv = [0.0] * 8
+
+    @property
+    def texture(self):
+        return self._current.texture
+
+    @property
+    def fading(self):
+        return self._fade is not None
+
+    def instruction_count(self):
+        # instructions of the decks being drawn, each a Color plus one Rectangle per layer
+        return sum(len(deck.children) for deck in self.group.children)
+
+    def set_texture(self, texture, fade=True):
+        if texture is None or texture is self._current.texture:
+            return
+        if self._fade is not None:
+            self._finish_fade()
+        incoming, outgoing = self._other, self._current
+        incoming.assign(texture)
+        self.group.add(incoming.group)
+        self._current, self._other = incoming, outgoing
+        self._distance = None  # the new deck needs its tex_coords
+        if not fade or outgoing.texture is None:
+            self._finish_fade()
+            return
+        self._fade = 0.0
+        incoming.color.a = 0.0
+
+    def update(self, distance, dt):
+        # distance: world distance scrolled (the simulation's score_distance); dt drives the fade
+        if self._fade is not None:
+            self._fade += dt / self.fade_seconds
+            if self._fade >= 1.0:
+                self._finish_fade()
+            else:
+                self._current.color.a = self._fade
+        if distance != self._distance:
+            self._distance = distance
+            self._scroll(self._current, distance)
+            if self._fade is not None:
+                self._scroll(self._other, distance)
+
+    def _finish_fade(self):
+        self._fade = None
+        self._current.color.a = 1.0
+        if self._other.group in self.group.children:  # not there on the very first texture
+            self.group.remove(self._other.group)
+        self._distance = None
+
+    def _scroll(self, deck, distance):
+        if deck.texture is None:
+            return
+        uv = self._uv
+        u0, du, v0, dv = deck.u0, deck.du, deck.v0, deck.dv
+        for rect, factor, bottom, top in deck.layers:
+            # keep u in [0, 1) widths (the texture repeats every width) so float precision holds
+            shift = (distance * factor / self.width) % 1.0 if deck.scrolls else 0.0
+            left = u0 + du * shift
+            right = left + du
+            low = v0 + dv * bottom
+            high = v0 + dv * top
+            uv[0] = left
+            uv[1] = low
+            uv[2] = right
+            uv[3] = low
+            uv[4] = right
+            uv[5] = high
+            uv[6] = left
+            uv[7] = high
+            rect.tex_coords = uv
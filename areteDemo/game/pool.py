@@ -0,0 +1,54 @@
+# Generic free-list pool. factory() makes a new item when the pool is empty;
+# release() hands an item back (after reset(item), if given) for the next
+# acquire(). The counters show whether steady state allocates: once play has
+# warmed up, `created` stops growing and `high_water` is the peak in use.
+class Pool:
+    def __init__(self, factory, reset=None, prealloc=0):
+        self.factory = factory
+        self.reset = reset
+        self._free = []
+        self.in_use = 0
+        self.high_water = 0
+        self.created = 0
+        self.acquired = 0
+        self.released = 0
+        self.reserve(prealloc)
+
+    def __len__(self):
+        # items waiting in the pool
+        return len(self._free)
+
+    def reserve(self, count):
+        # create items up front until `count` exist in total
+        while self.created < count:
+            self._free.append(self.factory())
+            self.created += 1
+
+    def acquire(self):
+        if self._free:
+            item = self._free.pop()
+        else:
+            item = self.factory()
+            self.created += 1
+        self.acquired += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return item
+
+    def release(self, item):
+        if self.reset is not None:
+            self.reset(item)
+        self._free.append(item)
+        self.released += 1
+        self.in_use -= 1
+
+    def stats(self):
+        return {
+            "in_use": self.in_use,
+            "free": len(self._free),
+            "high_water": self.high_water,
+            "created": self.created,
+            "acquired": self.acquired,
+            "released": self.released,
+        }
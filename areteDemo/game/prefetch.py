@@ -0,0 +1,78 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+
+# Decodes upcoming backgrounds on a worker thread and hands them to the main
+# thread for the (cheap) GPU upload, so update() never waits on image I/O.
+# Needed when the AssetCache budget has evicted the next theme, or after the
+# window changed texture variant.
+class BackgroundPrefetcher:
+    def __init__(self, cache):
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bg-prefetch")
+        self._pending = set()
+
+    def prefetch(self, theme):
+        if theme in self._pending or self.cache.has_background(theme):
+            return
+        self._pending.add(theme)
+        key = self.cache.background_key(theme)
+        # decode only; the texture is created on first .texture access, on the main thread
+        future = self._executor.submit(self.cache.decode_background, key)
+        # Clock.schedule_once is safe to call from the worker thread
+        future.add_done_callback(lambda f: Clock.schedule_once(lambda dt: self._finish(theme, key, f)))
+
+    def _finish(self, theme, key, future):
+        self._pending.discard(theme)
+        try:
+            image = future.result()
+        except Exception as e:
+            Logger.warning(f"Prefetch: could not load background {key} ({e})")
+            return
+        if key != self.cache.background_key(theme):
+            return  # the window changed variant while this was decoding
+        self.cache.put_background(theme, image.texture)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Reports the longest frame in a window around each background switch.
+class SwitchHitchMonitor:
+    def __init__(self, window=1.0):
+        self.window = window  # seconds before and after each switch
+        self.reports = []  # (theme, longest frame in seconds)
+        self._t = 0.0
+        self._recent = deque()  # (t, dt) for the last `window` seconds
+        self._open = None  # [theme, switch time, longest frame]
+
+    def reset(self):
+        self._t = 0.0
+        self._recent.clear()
+        self._open = None
+
+    def frame(self, dt, switched_to=None):
+        self._t += dt
+        recent = self._recent
+        recent.append((self._t, dt))
+        while recent[0][0] < self._t - self.window:
+            recent.popleft()
+
+        if switched_to is not None:
+            if self._open is not None:
+                self._close()
+            self._open = [switched_to, self._t, max(d for _, d in recent)]
+        elif self._open is not None:
+            if dt > self._open[2]:
+                self._open[2] = dt
+            if self._t - self._open[1] >= self.window:
+                self._close()
+
+    def _close(self):
+        theme, _, longest = self._open
+        self._open = None
+        self.reports.append((theme, longest))
+        Logger.info(f"Prefetch: longest frame around switch to theme {theme}: {longest * 1000:.1f} ms")
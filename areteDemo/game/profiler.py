@@ -0,0 +1,133 @@
+import csv
+import json
+import os
+import platform
+import time
+from collections import deque
+
+PROFILE_WINDOW = 600  # frames kept for the rolling percentiles (~10 s at 60 fps)
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(values):
+    values = sorted(values)
+    stats = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+    stats["mean"] = sum(values) / len(values) if values else 0.0
+    stats["max"] = values[-1] if values else 0.0
+    stats["samples"] = len(values)
+    return stats
+
+
+# Per-frame timing for GameWidget.update. Named sections are bracketed with
+# begin()/end() (cheaper than a context manager in the hot path) and summed over
+# the frame, so a section hit once per physics substep reports its per-frame
+# total; frame() closes the frame. Everything is in milliseconds over a rolling
+# window. Kivy-free, so the headless runner can use it too. Does nothing while
+# disabled.
+class FrameProfiler:
+    def __init__(self, window=PROFILE_WINDOW, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self.frame_times = deque(maxlen=window)  # time between frames
+        self.sections = {}  # name -> deque of section times
+        self.counters = {}  # name -> latest value (instruction count, obstacles, ...)
+        self._starts = {}
+        self._totals = {}  # name -> time spent in the current frame
+
+    def reset(self):
+        self.frame_times.clear()
+        self.sections.clear()
+        self.counters.clear()
+        self._starts.clear()
+        self._totals.clear()
+
+    def begin(self, name):
+        if self.enabled:
+            self._starts[name] = time.perf_counter()
+
+    def end(self, name):
+        if not self.enabled:
+            return
+        start = self._starts.pop(name, None)
+        if start is not None:
+            self._totals[name] = self._totals.get(name, 0.0) + (time.perf_counter() - start) * 1000.0
+
+    def count(self, name, value):
+        if self.enabled:
+            self.counters[name] = value
+
+    def frame(self, dt):
+        if not self.enabled:
+            return
+        self.frame_times.append(dt * 1000.0)
+        for name, total in self._totals.items():
+            samples = self.sections.get(name)
+            if samples is None:
+                samples = self.sections[name] = deque(maxlen=self.window)
+            samples.append(total)
+            self._totals[name] = 0.0
+
+    def histogram(self, bucket_ms=2.0, buckets=16):
+        # counts of frame times per bucket; the last bucket collects everything slower
+        counts = [0] * buckets
+        for ms in self.frame_times:
+            counts[min(buckets - 1, int(ms / bucket_ms))] += 1
+        return counts
+
+    def summary(self):
+        return {
+            "frame": summarize(self.frame_times),
+            "sections": {name: summarize(samples) for name, samples in self.sections.items()},
+            "counters": dict(self.counters),
+        }
+
+    def report(self):
+        # short multi-line text for the on-screen overlay
+        frame = summarize(self.frame_times)
+        lines = [f"frame   p50 {frame['p50']:5.1f}  p95 {frame['p95']:5.1f}  p99 {frame['p99']:5.1f} ms"]
+        for name, samples in self.sections.items():
+            s = summarize(samples)
+            lines.append(f"{name:<8}p50 {s['p50']:5.2f}  p95 {s['p95']:5.2f}  p99 {s['p99']:5.2f} ms")
+        lines.append("  ".join(f"{name} {value}" for name, value in self.counters.items()))
+        return "\n".join(lines)
+
+    def export_json(self, path):
+        data = {
+            "machine": platform.node(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "window": self.window,
+            "histogram_2ms": self.histogram(),
+        }
+        data.update(self.summary())
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def export_csv(self, path):
+        # one row per metric so runs from different machines can be concatenated
+        summary = self.summary()
+        rows = [("frame", summary["frame"])]
+        rows += sorted(summary["sections"].items())
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["machine", "metric", "samples", "mean", "max"] + [f"p{p}" for p in PERCENTILES])
+            for name, s in rows:
+                writer.writerow([platform.node(), name, s["samples"], f"{s['mean']:.3f}", f"{s['max']:.3f}"]
+                                + [f"{s[f'p{p}']:.3f}" for p in PERCENTILES])
+            for name, value in summary["counters"].items():
+                writer.writerow([platform.node(), name, 1, value, value] + [value] * len(PERCENTILES))
+        return path
+
+    def export(self, folder="profiles"):
+        os.makedirs(folder, exist_ok=True)
+        stem = os.path.join(folder, time.strftime("profile-%Y%m%d-%H%M%S"))
+        return self.export_json(stem + ".json"), self.export_csv(stem + ".csv")
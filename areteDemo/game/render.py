@@ -0,0 +1,106 @@
+from kivy.graphics import (Color, Rectangle, Ellipse, PushMatrix, PopMatrix, Rotate,
+                           InstructionGroup)
+
+from game.parallax import ParallaxBackground
+from game.pool import Pool
+
+
+# Retained-mode renderer for GameWidget.
+# All instructions are created once and added to the canvas; each frame only the
+# attributes that actually changed (pos / angle / texture) are written back.
+# Textures come preloaded from game.assets, so a theme switch is a handle swap
+# (cross-faded by the scrolling background, see game/parallax.py).
+class GameRenderer:
+    def __init__(self, canvas, width, height, player_radius):
+        self.canvas = canvas
+        self.player_radius = player_radius
+
+        self._player_color = None
+        self._player_pos = None
+
+        # obstacle slot -> Rectangle currently drawing it; rectangles come from a pool
+        self._active = {}
+        self.rect_pool = Pool(Rectangle)
+
+        # background layers come first so everything else draws on top
+        self.background = ParallaxBackground(canvas, width, height)
+
+        with canvas:
+            # obstacles share one white Color; their Rectangles live in this group
+            Color(1, 1, 1, 1)
+            self.obstacle_group = InstructionGroup()
+
+            # player (rolling circle)
+            PushMatrix()
+            self.player_rotate = Rotate(angle=0, origin=(0, 0))
+            self.player_color = Color(1, 1, 1, 1)
+            self.player_body = Ellipse(size=(player_radius * 2, player_radius * 2))
+            PopMatrix()
+
+            # player inner eye or dot
+            Color(0.96, 0.96, 0.96)
+            small = player_radius * 0.5
+            self.player_eye = Ellipse(size=(small, small))
+
+    def set_background(self, texture, fade=True):
+        # a new texture cross-fades in over the next frames unless fade is False
+        self.background.set_texture(texture, fade)
+
+    def scroll_background(self, distance, dt):
+        self.background.update(distance, dt)
+
+    def sync_obstacles(self, store, textures, offset=None):
+        # store is the simulation's ObstacleStore; textures[theme] is the sprite texture.
+        # offset overrides the store's scroll offset (render interpolation).
+        active = self._active
+        if offset is None:
+            offset = store.offset
+        world_x, ys, sizes, themes = store.world_x, store.y, store.size, store.theme
+        for slot in store:
+            rect = active.get(slot)
+            if rect is None:
+                rect = self._acquire_rect()
+                active[slot] = rect
+            pos = (world_x[slot] - offset, ys[slot])
+            if rect.pos != pos:
+                rect.pos = pos
+            size = sizes[slot]
+            if rect.size[0] != size:
+                rect.size = (size, size)
+            texture = textures[themes[slot]]
+            if rect.texture is not texture:
+                rect.texture = texture
+
+        # release rectangles of obstacles that are gone (passed, hit or reset)
+        if len(active) != len(store):
+            live = set(store)
+            for slot in [slot for slot in active if slot not in live]:
+                self._release_rect(active.pop(slot))
+
+    def instruction_count(self):
+        # fixed instructions plus the background decks and obstacle rectangles currently drawn
+        return (len(self.canvas.children) + self.background.instruction_count()
+                + len(self.obstacle_group.children))
+
+    def set_player(self, x, y, angle, color):
+        if self._player_pos != (x, y):
+            self._player_pos = (x, y)
+            r = self.player_radius
+            self.player_rotate.origin = (x, y)
+            self.player_body.pos = (x - r, y - r)
+            small = r * 0.5
+            self.player_eye.pos = (x - small / 2, y - small / 2)
+        if self.player_rotate.angle != angle:
+            self.player_rotate.angle = angle
+        if self._player_color != color:
+            self._player_color = list(color)
+            self.player_color.rgba = color
+
+    def _acquire_rect(self):
+        rect = self.rect_pool.acquire()
+        self.obstacle_group.add(rect)
+        return rect
+
+    def _release_rect(self, rect):
+        self.obstacle_group.remove(rect)
+        self.rect_pool.release(rect)
@@ -0,0 +1,234 @@
+# Session replays. A session is fully determined by its seed and the frames at
+# which a jump took effect (see GameSimulation), so that is all a log stores,
+# plus the theme switches and the final result as a cross-check. A full
+# GAME_DURATION session comes to well under a few KB.
+#
+# Binary layout (little-endian, varints are unsigned LEB128):
+#   b"ARPL"  u8 version  u16 physics hz  f64 duration  varint seed (zig-zag, so
+#   negative seeds fit; version 1 files stored it plain)
+#   varint n  then n varint jump frames, each a delta from the previous one
+#   varint n  then n x (varint frame delta, u8 theme)  theme switches
+#   varint final score  varint frames
+#
+#   python -m game.replay replays/*.arpl             # verify, unthrottled
+#   python -m game.replay --realtime replays/x.arpl  # play back at wall-clock speed
+import argparse
+import os
+import struct
+import time
+
+from game.constants import GAME_DURATION, PHYSICS_HZ
+from game.simulation import GameSimulation
+
+MAGIC = b"ARPL"
+VERSION = 2
+READ_VERSIONS = (1, 2)
+_HEADER = struct.Struct("<4sBHd")
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def _put_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _zigzag(n):
+    # signed -> unsigned: 0, -1, 1, -2, ... -> 0, 1, 2, 3, ...
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n):
+    return n >> 1 if not n & 1 else -(n >> 1) - 1
+
+
+def _get_varint(data, pos):
+    n = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated replay")
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+class Replay:
+    def __init__(self, seed, physics_hz=PHYSICS_HZ, duration=GAME_DURATION,
+                 jumps=None, switches=None, final_score=None, frames=None):
+        self.seed = seed
+        self.physics_hz = physics_hz
+        self.duration = duration
+        self.jumps = jumps if jumps is not None else []  # frame indexes
+        self.switches = switches if switches is not None else []  # (frame, theme)
+        self.final_score = final_score
+        self.frames = frames
+
+    def to_bytes(self):
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.physics_hz, self.duration))
+        _put_varint(out, _zigzag(self.seed))
+        _put_varint(out, len(self.jumps))
+        last = 0
+        for frame in self.jumps:
+            _put_varint(out, frame - last)
+            last = frame
+        _put_varint(out, len(self.switches))
+        last = 0
+        for frame, theme in self.switches:
+            _put_varint(out, frame - last)
+            out.append(theme)
+            last = frame
+        _put_varint(out, self.final_score or 0)
+        _put_varint(out, self.frames or 0)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < _HEADER.size:
+            raise ReplayError("truncated replay")
+        magic, version, physics_hz, duration = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a replay file")
+        if version not in READ_VERSIONS:
+            raise ReplayError(f"unsupported replay version {version}")
+        pos = _HEADER.size
+        seed, pos = _get_varint(data, pos)
+        if version >= 2:
+            seed = _unzigzag(seed)
+        count, pos = _get_varint(data, pos)
+        jumps = []
+        frame = 0
+        for _ in range(count):
+            delta, pos = _get_varint(data, pos)
+            frame += delta
+            jumps.append(frame)
+        count, pos = _get_varint(data, pos)
+        switches = []
+        frame = 0
+        for _ in range(count):
+            delta, pos = _get_varint(data, pos)
+            if pos >= len(data):
+                raise ReplayError("truncated replay")
+            frame += delta
+            switches.append((frame, data[pos]))
+            pos += 1
+        final_score, pos = _get_varint(data, pos)
+        frames, pos = _get_varint(data, pos)
+        return cls(seed, physics_hz, duration, jumps, switches, final_score, frames)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+# Attached as sim.recorder; GameSimulation reports the jumps that took effect
+# and the theme switches to it.
+class ReplayRecorder:
+    def __init__(self, sim):
+        self.start(sim)
+
+    def start(self, sim):
+        # call after sim.reset(): a new log for the new seed
+        self.sim = sim
+        self.replay = Replay(sim.seed, int(round(1.0 / sim.dt)), sim.duration)
+        sim.recorder = self
+
+    def jump(self, frame):
+        self.replay.jumps.append(frame)
+
+    def theme(self, frame, index):
+        self.replay.switches.append((frame, index))
+
+    def finish(self):
+        self.replay.final_score = self.sim.final_score
+        self.replay.frames = self.sim.frame
+        return self.replay
+
+    def save(self, folder="replays"):
+        replay = self.finish()
+        os.makedirs(folder, exist_ok=True)
+        name = time.strftime("replay-%Y%m%d-%H%M%S") + f"-{replay.seed}.arpl"
+        return replay.save(os.path.join(folder, name))
+
+
+# Feeds a log's jumps back into a simulation: call before_step(sim) before each
+# sim.step(). Used by replay() below and by GameWidget.play_replay.
+class ReplayPlayer:
+    def __init__(self, replay):
+        self.replay = replay
+        self._next = 0
+
+    def before_step(self, sim):
+        jumps = self.replay.jumps
+        while self._next < len(jumps) and jumps[self._next] <= sim.frame:
+            if jumps[self._next] == sim.frame:
+                sim.jump()
+            self._next += 1
+
+
+def new_simulation(replay):
+    return GameSimulation(seed=replay.seed, dt=1.0 / replay.physics_hz, duration=replay.duration)
+
+
+def replay(log, realtime=False):
+    # re-simulates the log and returns (sim, mismatches); unthrottled unless realtime
+    sim = new_simulation(log)
+    player = ReplayPlayer(log)
+    check = ReplayRecorder(sim)
+    start = time.perf_counter()
+    while not sim.game_over:
+        player.before_step(sim)
+        sim.step()
+        if realtime:
+            delay = start + sim.frame * sim.dt - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    return sim, compare(log, check.finish())
+
+
+def compare(expected, actual):
+    # list of human-readable differences between a log and its re-simulation
+    mismatches = []
+    if expected.jumps != actual.jumps:
+        mismatches.append("jumps")
+    if expected.switches != actual.switches:
+        mismatches.append("theme switches")
+    if expected.final_score is not None and expected.final_score != actual.final_score:
+        mismatches.append(f"score {expected.final_score} != {actual.final_score}")
+    if expected.frames and expected.frames != actual.frames:
+        mismatches.append(f"frames {expected.frames} != {actual.frames}")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify or play back game replays.")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--realtime", action="store_true", help="run at wall-clock speed")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.paths:
+        log = Replay.load(path)
+        t0 = time.perf_counter()
+        sim, mismatches = replay(log, realtime=args.realtime)
+        elapsed = time.perf_counter() - t0
+        status = "OK" if not mismatches else "MISMATCH: " + ", ".join(mismatches)
+        print(f"{path}: seed {log.seed} score {sim.final_score} ({sim.frame} frames in {elapsed:.2f}s) {status}")
+        failed += bool(mismatches)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+import random
+
+from game.constants import (
+    WINDOW_WIDTH, FLOOR_HEIGHT, PLAYER_X, PLAYER_RADIUS, GRAVITY, JUMP_VELOCITY, JUMP_BUFFER_SECONDS,
+    INITIAL_SPEED, MIN_SPEED, SPEED_INCREASE_PER_5_AVOIDED, OBSTACLE_MIN_SIZE, OBSTACLE_MAX_SIZE,
+    OBSTACLE_SPAWN_JITTER, SPAWN_INTERVAL_BASE, SLOW_ON_HIT_MULTIPLIER, GAME_DURATION,
+    THEME_COUNT, BG_SWITCH_SECONDS, OBSTACLE_PREVIEW_SECONDS, SIM_DT,
+)
+from game.obstacles import ObstacleStore
+
+
+# Pure-Python game state and rules, no Kivy, no wall clock.
+# Everything random comes from self.rng, so the same seed and the same jump
+# inputs always play out the same session. GameWidget wraps this for rendering;
+# game/headless.py runs it without a window.
+class GameSimulation:
+    def __init__(self, seed=None, dt=SIM_DT, duration=GAME_DURATION):
+        self.dt = dt
+        self.duration = duration
+        self.profiler = None  # optional FrameProfiler timing the spawn/collide sections
+        self.recorder = None  # optional game.replay.ReplayRecorder logging jumps/theme switches
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.frame = 0
+        self.elapsed = 0.0
+        self.game_over = False
+
+        self.speed = INITIAL_SPEED
+        self.base_speed = INITIAL_SPEED
+
+        self.player_x = PLAYER_X
+        self.player_y = FLOOR_HEIGHT + PLAYER_RADIUS
+        self.player_vy = 0.0
+        self.player_radius = PLAYER_RADIUS
+        # jump forgiveness: request_jump() keeps a press pending for JUMP_BUFFER_SECONDS
+        self.jump_buffer = 0.0
+        self.jump_count = 0
+        # state before the last step, for render interpolation
+        self.prev_player_y = self.player_y
+        self.prev_offset = 0.0
+
+        # kept sorted by x (left edge): everything moves left at the same speed,
+        # so spawn order is x order and expired obstacles leave from the left
+        if hasattr(self, "obstacles"):
+            self.obstacles.clear()
+        else:
+            self.obstacles = ObstacleStore()
+        self.score_distance = 0.0
+        self.avoided_count = 0
+        self.hit_count = 0
+
+        self.bg_index = 0
+        self.bg_elapsed = 0.0
+
+        self._spawn_accumulator = 0.0
+        self._last_speed_milestone = 0
+
+    @property
+    def final_score(self):
+        return int(self.score_distance) + self.avoided_count * 100
+
+    @property
+    def time_to_switch(self):
+        return BG_SWITCH_SECONDS - self.bg_elapsed
+
+    def interpolated(self, alpha):
+        # (player_y, obstacle scroll offset) a fraction alpha of the way through the last step
+        y = self.prev_player_y + (self.player_y - self.prev_player_y) * alpha
+        offset = self.prev_offset + (self.obstacles.offset - self.prev_offset) * alpha
+        return y, offset
+
+    def on_ground(self):
+        # player's center y equals ground + radius
+        return abs(self.player_y - (FLOOR_HEIGHT + PLAYER_RADIUS)) < 1.0 and self.player_vy <= 0.0
+
+    def can_jump(self):
+        return not self.game_over and self.on_ground()
+
+    def jump(self):
+        if not self.can_jump():
+            return False
+        self.player_vy = JUMP_VELOCITY
+        self.jump_buffer = 0.0
+        self.jump_count += 1
+        if self.recorder is not None:
+            self.recorder.jump(self.frame)  # takes effect in the next step
+        return True
+
+    def request_jump(self):
+        # player input: jump now if possible, otherwise keep it buffered; the step
+        # that can first jump does it (that step's frame is what replays record)
+        if self.jump():
+            return True
+        if not self.game_over:
+            self.jump_buffer = JUMP_BUFFER_SECONDS
+        return False
+
+    def spawn_obstacle(self):
+        # spawn a square obstacle at right side
+        size = self.rng.randint(OBSTACLE_MIN_SIZE, OBSTACLE_MAX_SIZE)
+        x = WINDOW_WIDTH + self.rng.randint(0, OBSTACLE_SPAWN_JITTER)
+        y = FLOOR_HEIGHT
+
+        # If we are within N seconds of a background switch,
+        # spawn obstacles using the NEXT background's obstacle theme
+        if self.time_to_switch <= OBSTACLE_PREVIEW_SECONDS:
+            theme = (self.bg_index + 1) % THEME_COUNT
+        else:
+            theme = self.bg_index
+        return self.obstacles.spawn(x, y, size, theme)
+
+    def step(self, dt=None, jump=False):
+        if self.game_over:
+            return
+        if dt is None:
+            dt = self.dt
+        if jump:
+            self.jump()
+        elif self.jump_buffer > 0.0 and not self.jump():
+            self.jump_buffer = max(0.0, self.jump_buffer - dt)
+
+        self.frame += 1
+        self.elapsed += dt
+        # game end condition
+        if self.elapsed >= self.duration:
+            self.game_over = True
+            return
+
+        # background change every BG_SWITCH_SECONDS
+        self.bg_elapsed += dt
+        if self.bg_elapsed >= BG_SWITCH_SECONDS:
+            self.bg_elapsed = 0.0
+            self.bg_index = (self.bg_index + 1) % THEME_COUNT
+            if self.recorder is not None:
+                self.recorder.theme(self.frame, self.bg_index)
+
+        # move obstacles left by speed*dt (one scroll of the whole store)
+        self.obstacles.scroll(self.speed * dt)
+        self.prev_offset = self.obstacles.offset - self.speed * dt  # also right after a rebase
+
+        # spawn logic: accumulator and a spawn interval
+        spawn_interval = max(0.4, SPAWN_INTERVAL_BASE)
+        self._spawn_accumulator += dt
+        if self._spawn_accumulator >= spawn_interval:
+            self._spawn_accumulator = 0.0
+            if self.profiler is not None:
+                self.profiler.begin("spawn")
+                self.spawn_obstacle()
+                self.profiler.end("spawn")
+            else:
+                self.spawn_obstacle()
+
+        # physics: player vertical
+        self.prev_player_y = self.player_y
+        self.player_vy += GRAVITY * dt
+        self.player_y += self.player_vy * dt
+        # collision with ground
+        if self.player_y < FLOOR_HEIGHT + PLAYER_RADIUS:
+            self.player_y = FLOOR_HEIGHT + PLAYER_RADIUS
+            self.player_vy = 0.0
+
+        # speed increase logic: every 5 avoided, increase speed by a fixed amount (once per milestone)
+        milestone = self.avoided_count // 5
+        if milestone > self._last_speed_milestone:
+            self._last_speed_milestone = milestone
+            self.base_speed += SPEED_INCREASE_PER_5_AVOIDED
+            self.speed += SPEED_INCREASE_PER_5_AVOIDED
+
+        # distance traveled: speed * dt
+        self.score_distance += self.speed * dt
+
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin("collide")
+        self._collide()
+        self._expire_passed()
+        if profiler is not None:
+            profiler.end("collide")
+
+    def _collide(self):
+        # collision detection: circle vs squares, only for obstacles that overlap
+        # the player's x-window [cx - r, cx + r]
+        cx = self.player_x
+        cy = self.player_y
+        r = self.player_radius
+        r2 = r * r
+        store = self.obstacles
+        order = store.order
+        world_x, ys, sizes, offset = store.world_x, store.y, store.size, store.offset
+        # anything with x < cx - r - OBSTACLE_MAX_SIZE ends left of the window
+        i = store.bisect(cx - r - OBSTACLE_MAX_SIZE)
+        window_right = cx + r
+        n = len(order)
+        while i < n:
+            slot = order[i]
+            x = world_x[slot] - offset
+            if x > window_right:
+                break
+            y = ys[slot]
+            size = sizes[slot]
+            # AABB-circle collision test
+            nearest_x = max(x, min(cx, x + size))
+            nearest_y = max(y, min(cy, y + size))
+            dx = cx - nearest_x
+            dy = cy - nearest_y
+            if (dx*dx + dy*dy) <= r2:
+                # collision! slow the world down to show the impact
+                store.remove_at(i)
+                self.hit_count += 1
+                self.speed = max(MIN_SPEED, self.speed * SLOW_ON_HIT_MULTIPLIER)
+                break  # only one hit per frame
+            i += 1
+
+    def _expire_passed(self):
+        # obstacles that passed left edge without collision -> avoided.
+        # They leave from the left, so pop them off the front of the store.
+        store = self.obstacles
+        order = store.order
+        while order and store.right(order[0]) < 0:
+            store.popleft()
+            self.avoided_count += 1
+        # sizes differ, so one just behind the front can be fully off screen first;
+        # only obstacles with x < 0 can be, which is a handful at the front
+        i = 1
+        while i < len(order) and store.x(order[i]) < 0:
+            if store.right(order[i]) < 0:
+                store.remove_at(i)
+                self.avoided_count += 1
+            else:
+                i += 1
@@ -0,0 +1,35 @@
+from game.constants import SIM_DT, MAX_SUBSTEPS
+
+
+# Fixed-step accumulator: turns whatever frame dt the Clock delivers into a whole
+# number of SIM_DT physics steps. Leftover time carries to the next frame and
+# gives the interpolation factor for rendering. After a stall, at most
+# max_substeps steps run and the rest of the time is dropped, so one slow frame
+# can't snowball into ever longer catch-up frames.
+class FixedStepper:
+    def __init__(self, dt=SIM_DT, max_substeps=MAX_SUBSTEPS):
+        self.dt = dt
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # total game time skipped by the catch-up cap
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.dropped_time = 0.0
+
+    def advance(self, frame_dt):
+        # returns how many physics steps to run for this frame
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_substeps:
+            dropped = (steps - self.max_substeps) * self.dt
+            self.dropped_time += dropped
+            self.accumulator -= dropped
+            steps = self.max_substeps
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        # how far the render time is between the last two physics states (0..1)
+        return min(1.0, max(0.0, self.accumulator / self.dt))
@@ -1,38 +1,114 @@
+import os
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.lang import Builder
-from kivy.properties import NumericProperty, StringProperty, ListProperty
-from kivy.core.window import Window
-from arete import db, auth
-from capstone_game_demo_kivy import GameWidget
+from kivy.properties import NumericProperty, StringProperty, ListProperty, BooleanProperty
+from kivy.logger import Logger
+from arete import db, auth, security, tasks, stats, reflection
 
-db.init_db()
+# Startup is staged: only the login screen is built before the first frame. The
+# other screens are built on first navigation (LazyScreenManager), the game module
+# is imported when the game screen is first opened, and the database (schema is
+# created on first connection) and argon2 are warmed up on a task thread.
+WARM_UP_DELAY = 0.5  # seconds after start, so the warm-up doesn't compete with the first frames
+# "Remember me" keeps a session token (see auth.create_session) in this file under
+# the app's user_data_dir; on start it is checked with one indexed lookup instead
+# of argon2. Logging out or deleting the account revokes it.
+SESSION_TOKEN_FILE = "session_token"
 
-REFLECTION_QUESTIONS = [ 
-    {"text": "How many clusters off purple seaweed were in the background?", "choices": ["2", "3", "1", "4"], "correct": 3},
-    {"text": "What color was the seashell in the sea background?", "choices": ["Blue", "Red", "Purple", "Green"], "correct": 2},
-    {"text": "How many sea rocks were in the background?", "choices": ["1", "2", "3", "4"], "correct": 1},
-    {"text": "How many red flowers were in the forest background?", "choices": ["2", "3", "1", "4"], "correct": 1},
-    {"text": "What color was the other flower in the forest background?", "choices": ["Blue", "Red", "Purple", "Green"], "correct": 0},
-    {"text": "In the space background how many planets were there?", "choices": ["1", "2", "3", "4"], "correct": 1},
-    {"text": "What color was the spaceship in the space background?", "choices": ["Blue", "Red", "White", "Green"], "correct": 2},
-
-]
+# background task results (argon2 hashing, db writes) come back on the UI thread
+tasks.set_dispatcher(lambda fn: Clock.schedule_once(lambda dt: fn()))
 
 Builder.load_file("main.kv")
 
+class LazyScreenManager(ScreenManager):
+    # factories: screen name -> callable returning the screen; each is built on first get_screen()
+    # (which is also what setting `current` goes through) and then kept
+    def __init__(self, factories, **kwargs):
+        self.factories = dict(factories)
+        super().__init__(**kwargs)
+
+    def get_screen(self, name):
+        factory = self.factories.pop(name, None)
+        if factory is not None:
+            self.add_widget(factory())
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        return name in self.factories or super().has_screen(name)
+
+
+def _warm_up():
+    # runs on a task thread
+    db.get_connection()
+    reflection.get_questions()
+    security.warm_up()
+
+
 class LoginScreen(Screen):
-    def attempt_login(self, email, password):
-        user = auth.login(email, password)
+    # True while argon2 verification (or a stored token check) runs in the background
+    pending = BooleanProperty(False)
+
+    def attempt_login(self, email, password, remember=False):
+        if self.pending:
+            return
+        self.pending = True
+        self.ids.message.text = ""
+        auth.login_async(email, password, remember=remember, callback=self._on_login_done)
+
+    def resume(self, token):
+        self.pending = True
+        tasks.submit(auth.resume_session, token, callback=self._on_resume_done)
+
+    def _on_resume_done(self, future):
+        self.pending = False
+        try:
+            user = future.result()
+        except Exception as e:
+            Logger.exception(f"Resuming session failed: {e}")
+            return
+        if user:
+            self.manager.current = "menu"
+            self.manager.get_screen("menu").current_user_id = user[0]
+        else:
+            # expired or revoked: forget it and show the login form
+            App.get_running_app().clear_session_token()
+
+    def _on_login_done(self, future):
+        self.pending = False
+        try:
+            user = future.result()
+        except Exception as e:
+            Logger.exception(f"Login failed: {e}")
+            user = None
         if user:
+            if len(user) > 1:
+                App.get_running_app().save_session_token(user[1])
             self.manager.current = "menu"
             self.manager.get_screen("menu").current_user_id = user[0]
         else:
             self.ids.message.text = "Invalid email or password."
 
 class SignupScreen(Screen):
+    # True while the password is hashed and the account written in the background
+    pending = BooleanProperty(False)
+
     def attempt_signup(self, email, password, first_name, last_name):
-        success = auth.signup(email, password, first_name, last_name)
+        if self.pending:
+            return
+        self.pending = True
+        self.ids.message.text = ""
+        auth.signup_async(email, password, first_name, last_name, callback=self._on_signup_done)
+
+    def _on_signup_done(self, future):
+        self.pending = False
+        try:
+            success = future.result()
+        except Exception as e:
+            Logger.exception(f"Signup failed: {e}")
+            self.ids.message.text = "Could not create account."
+            return
         if success:
             self.manager.current = "login"
         else:
@@ -57,82 +133,111 @@ class ProfileScreen(Screen):
         auth.update_user(user_id, first_name, last_name)
         self.on_pre_enter()
 
-class StatsScreen(Screen): pass
+class StatsScreen(Screen):
+    high_score = NumericProperty(0)
+    games_played = NumericProperty(0)
+    leaderboard_text = StringProperty("")
+
+    def on_pre_enter(self):
+        # both are single index lookups, cheap enough for the UI thread
+        user_id = self.manager.get_screen("menu").current_user_id
+        self.high_score, self.games_played = stats.get_stats(user_id)
+        lines = []
+        for rank, (first_name, last_name, email, score) in enumerate(stats.leaderboard(5), start=1):
+            name = f"{first_name or ''} {last_name or ''}".strip() or email
+            lines.append(f"{rank}. {name} - {score}")
+        self.leaderboard_text = "\n".join(lines) or "No games played yet"
+
 class InfoScreen(Screen): pass
 
 class SettingsScreen(Screen):
     def delete_account(self):
         user_id = self.manager.get_screen("menu").current_user_id
-        auth.delete_user(user_id)
+        auth.delete_user(user_id)  # also revokes its session tokens
+        App.get_running_app().clear_session_token()
         self.manager.current = "login"
 
 class GameScreen(Screen):
+    game = None  # the GameWidget, created the first time the screen is shown
+
     def on_pre_enter(self):
-        # Resize window for game and add game widget once
-        Window.size = (1920, 1080)
-        container = self.ids.game_container
-        
-        # 1. Create GameWidget if it doesn't exist
-        if len(container.children) == 1:  # only the Back button
-            gw = GameWidget(embedded=True, size_hint=(1, 1))
-            gw.on_game_over_callback = self._go_to_reflection
-            container.add_widget(gw, index=0)
+        # 1. Create GameWidget if it doesn't exist; it scales itself to whatever size the window is.
+        # The game module (and its textures) are only loaded at this point.
+        if self.game is None:
+            from capstone_game_demo_kivy import GameWidget
+            self.game = GameWidget(embedded=True, size_hint=(1, 1))
+            self.game.on_game_over_callback = self._go_to_reflection
+            self.ids.game_container.add_widget(self.game, index=0)
 
         # 2. [Restore] Apply player color from App to GameWidget
         app = App.get_running_app()
-        for child in container.children:
-            if isinstance(child, GameWidget):
-                # Check for method first (best practice)
-                if hasattr(child, 'set_player_color'):
-                     child.set_player_color(*app.player_color)
-                # Fallback to direct property
-                elif hasattr(child, 'player_color'):
-                    child.player_color = app.player_color
+        self.game.set_player_color(*app.player_color)
 
     def _go_to_reflection(self):
+        self._record_game()
         sm = self.manager
         refl = sm.get_screen("reflection")
         refl.return_to = "game"
         refl.start_quiz()
         sm.current = "reflection"
 
+    def _record_game(self):
+        # buffered here, written in one background transaction
+        user_id = self.manager.get_screen("menu").current_user_id
+        if user_id >= 0:
+            sim = self.game.sim
+            stats.recorder.record(user_id, sim.final_score, int(sim.score_distance), sim.avoided_count)
+        stats.recorder.flush(callback=self._on_games_written)
+
+    def _on_games_written(self, future):
+        error = future.exception()
+        if error is not None:
+            # stats.recorder keeps the games and retries them with the next flush
+            Logger.error(f"Stats: could not save finished games, will retry: {error!r}")
+
+    def on_enter(self):
+        # the game loop and key binding only live while this screen is shown
+        self.game.activate()
+
     def on_leave(self):
-        container = self.ids.game_container
-        if len(container.children) >= 2:
-             for child in container.children:
-                if isinstance(child, GameWidget):
-                    child.is_running = False
+        self.game.deactivate()
 
 class ReflectionScreen(Screen):
     return_to = StringProperty("menu")
     question_index = NumericProperty(0)
-    answers = ListProperty([])
+    answers = ListProperty([])  # (question_id, choice index)
+    questions = []
 
     def start_quiz(self):
+        self.questions = reflection.get_questions()
         self.question_index = 0
         self.answers = []
         self._show_question()
 
     def _show_question(self):
-        if self.question_index >= len(REFLECTION_QUESTIONS):
+        if self.question_index >= len(self.questions):
             self._show_done()
             return
-        q = REFLECTION_QUESTIONS[self.question_index]
+        q = self.questions[self.question_index]
         self.ids.question_label.text = q["text"]
         choices = q["choices"]
         for i in range(4):
             self.ids[f"choice_{i}"].text = choices[i] if i < len(choices) else ""
-        self.ids.progress_label.text = f"Question {self.question_index + 1} of {len(REFLECTION_QUESTIONS)}"
+        self.ids.progress_label.text = f"Question {self.question_index + 1} of {len(self.questions)}"
         self.ids.quiz_box.opacity = 1
         self.ids.done_box.opacity = 0
         self.ids.done_box.disabled = True
 
     def on_choice(self, index):
-        self.answers.append(index)
+        self.answers.append((self.questions[self.question_index]["id"], index))
         self.question_index += 1
         self._show_question()
 
     def _show_done(self):
+        user_id = self.manager.get_screen("menu").current_user_id
+        if self.answers and user_id >= 0:
+            # one background transaction: attempt, answers and the per-question totals
+            reflection.save_attempt_async(user_id, self.answers, callback=self._on_saved)
         self.ids.quiz_box.opacity = 0
         self.ids.quiz_box.disabled = True
         self.ids.done_box.opacity = 1
@@ -140,6 +245,12 @@ class ReflectionScreen(Screen):
         self.ids.done_label.text = "Thank You for Playing!"
         self.ids.done_back_btn.text = "Back to game" if self.return_to == "game" else "Back to menu"
 
+    def _on_saved(self, future):
+        try:
+            future.result()
+        except Exception as e:
+            Logger.exception(f"Saving reflection answers failed: {e}")
+
     def go_back(self):
         self.manager.current = self.return_to
 
@@ -148,17 +259,58 @@ class AreteApp(App):
     player_color = ListProperty([1, 1, 1, 1]) 
 
     def build(self):
-        sm = ScreenManager()
+        sm = LazyScreenManager({
+            "signup": lambda: SignupScreen(name="signup"),
+            "menu": lambda: MenuScreen(name="menu"),
+            "profile": lambda: ProfileScreen(name="profile"),
+            "stats": lambda: StatsScreen(name="stats"),
+            "info": lambda: InfoScreen(name="info"),
+            "settings": lambda: SettingsScreen(name="settings"),
+            "game": lambda: GameScreen(name="game"),
+            "reflection": lambda: ReflectionScreen(name="reflection"),
+        })
         sm.add_widget(LoginScreen(name="login"))
-        sm.add_widget(SignupScreen(name="signup"))
-        sm.add_widget(MenuScreen(name="menu"))
-        sm.add_widget(ProfileScreen(name="profile"))
-        sm.add_widget(StatsScreen(name="stats"))
-        sm.add_widget(InfoScreen(name="info"))
-        sm.add_widget(SettingsScreen(name="settings"))
-        sm.add_widget(GameScreen(name="game"))
-        sm.add_widget(ReflectionScreen(name="reflection"))
         return sm
 
+    def on_start(self):
+        token = self.load_session_token()
+        if token:
+            self.root.get_screen("login").resume(token)
+        Clock.schedule_once(lambda dt: tasks.submit(_warm_up), WARM_UP_DELAY)
+
+    def logout(self):
+        token = self.load_session_token()
+        if token:
+            tasks.submit(auth.revoke_session, token)
+        self.clear_session_token()
+        self.root.get_screen("menu").current_user_id = -1
+        self.root.current = "login"
+
+    def _session_token_path(self):
+        return os.path.join(self.user_data_dir, SESSION_TOKEN_FILE)
+
+    def load_session_token(self):
+        try:
+            with open(self._session_token_path(), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def save_session_token(self, token):
+        # readable by this user only
+        fd = os.open(self._session_token_path(), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(token)
+
+    def clear_session_token(self):
+        try:
+            os.remove(self._session_token_path())
+        except OSError:
+            pass
+
+    def on_stop(self):
+        tasks.shutdown()
+        db.close_all()
+
 if __name__ == "__main__":
     AreteApp().run()
@@ -0,0 +1,18 @@
+import pytest
+
+from arete import db
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    # a fresh arete database file per test
+    monkeypatch.setattr(db, "DB_NAME", str(tmp_path / "arete.db"))
+    db.init_db()
+    yield db
+    db.close_all()
+
+
+def add_user(email="student@example.com"):
+    with db.transaction() as cursor:
+        cursor.execute("INSERT INTO users (email, password) VALUES (?, ?)", (email, "x"))
+        return cursor.lastrowid
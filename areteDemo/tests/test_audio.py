@@ -0,0 +1,103 @@
+# Voice-stealing rules of game.audio.AudioEngine, with stand-in sounds and a
+# fake clock (no audio provider needed). Run from the areteDemo folder:
+#   python -m pytest tests
+import pytest
+
+from game.audio import AudioEngine, Voice
+
+
+class FakeSound:
+    def __init__(self, length):
+        self.length = length
+        self.plays = 0
+        self.stops = 0
+
+    def play(self):
+        self.plays += 1
+
+    def stop(self):
+        self.stops += 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_engine(clips, max_voices):
+    # clips: name -> (voices, length in seconds)
+    clock = FakeClock()
+    engine = AudioEngine(clips={}, max_voices=max_voices, clock=clock)
+    for clip, (count, length) in clips.items():
+        engine.voices[clip] = [Voice(FakeSound(length), clip) for _ in range(count)]
+    return engine, clock
+
+
+def play_at(engine, clock, t, clip):
+    clock.now = t
+    return engine.play(clip)
+
+
+def test_expired_voices_do_not_count_against_the_cap():
+    engine, clock = make_engine({"long": (1, 2.0), "jump": (2, 0.3)}, max_voices=3)
+    for t, clip in ((0.0, "long"), (0.0, "jump"), (0.1, "jump"), (0.5, "jump"), (0.6, "jump")):
+        play_at(engine, clock, t, clip)
+    assert engine.stolen == 0
+    assert engine.voices["long"][0].sound.stops == 0
+    assert len(engine._playing) == 3
+    assert len(set(map(id, engine._playing))) == 3
+
+
+def test_busy_clip_restarts_its_oldest_voice():
+    engine, clock = make_engine({"jump": (2, 1.0)}, max_voices=6)
+    first, second = engine.voices["jump"]
+    play_at(engine, clock, 0.0, "jump")
+    play_at(engine, clock, 0.1, "jump")
+    play_at(engine, clock, 0.2, "jump")
+    assert engine.stolen == 1
+    assert first.sound.stops == 1 and first.sound.plays == 2
+    assert second.sound.stops == 0
+    assert list(engine._playing) == [second, first]
+
+
+def test_cap_stops_the_oldest_sounding_voice():
+    engine, clock = make_engine({"a": (1, 1.0), "b": (1, 1.0), "c": (1, 1.0)}, max_voices=2)
+    play_at(engine, clock, 0.0, "a")
+    play_at(engine, clock, 0.1, "b")
+    play_at(engine, clock, 0.2, "c")
+    a, b, c = (engine.voices[name][0] for name in "abc")
+    assert engine.stolen == 1
+    assert a.sound.stops == 1 and b.sound.stops == 0
+    assert list(engine._playing) == [b, c]
+    # a was cut off, so it is free again straight away
+    play_at(engine, clock, 0.3, "a")
+    assert engine.stolen == 2 and b.sound.stops == 1
+
+
+def test_missing_clip_is_silent():
+    engine, clock = make_engine({}, max_voices=2)
+    assert play_at(engine, clock, 0.0, "jump") is False
+    assert engine.played == 0
+
+
+class FakeWidget:
+    events = ("on_jump",)
+
+    def __init__(self):
+        self.bound = {}
+
+    def is_event_type(self, name):
+        return name in self.events
+
+    def bind(self, **handlers):
+        self.bound.update(handlers)
+
+
+def test_attach_rejects_unknown_events():
+    engine, _ = make_engine({"jump": (1, 0.3)}, max_voices=2)
+    engine.attach(FakeWidget(), {"on_jump": "jump"})
+    with pytest.raises(ValueError):
+        engine.attach(FakeWidget(), {"on_game_over": "jump"})
@@ -0,0 +1,63 @@
+# Parity of the NumPy batch simulator with GameSimulation: with the same seed
+# (through MatchedRandom) and the same inputs, every game scores the same.
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from game.batch import BatchSimulation, MatchedRandom
+from game.headless import heuristic_policy, run_session
+from game.simulation import GameSimulation
+
+SEEDS = [1, 2, 3, -4]
+DURATION = 60
+
+
+def heuristic_jump_frames(seed):
+    sim = GameSimulation(seed=seed, duration=DURATION)
+    frames = []
+    while not sim.game_over:
+        jump = heuristic_policy(sim)
+        if jump:
+            frames.append(sim.frame)
+        sim.step(jump=jump)
+    return frames
+
+
+def run_batch_with(per_game_frames, method):
+    batch = BatchSimulation(len(SEEDS), duration=DURATION, rng=MatchedRandom(SEEDS))
+    frame_sets = [set(frames) for frames in per_game_frames]
+    while not batch.game_over:
+        mask = np.array([batch.frame in frames for frames in frame_sets])
+        if method == "step":
+            batch.step(jump=mask)
+        else:
+            batch.request_jump(mask)
+            batch.step()
+    return batch.results()
+
+
+def test_same_seed_and_jump_frames_give_the_same_score():
+    frames = [heuristic_jump_frames(seed) for seed in SEEDS]
+    results = run_batch_with(frames, "step")
+    expected = [run_session(seed, inputs=f, duration=DURATION) for seed, f in zip(SEEDS, frames)]
+    assert results["score"].tolist() == [r["score"] for r in expected]
+    assert results["hits"].tolist() == [r["hits"] for r in expected]
+    assert results["avoided"].tolist() == [r["avoided"] for r in expected]
+
+
+def test_buffered_requests_match_game_simulation():
+    # a press every 65 frames comes ~10 frames before the landing of the jump two
+    # presses earlier (airtime ~140 frames), so landings are decided by the buffer
+    presses = set(range(5, DURATION * 120, 65))
+    expected = []
+    for seed in SEEDS:
+        sim = GameSimulation(seed=seed, duration=DURATION)
+        immediate = 0
+        while not sim.game_over:
+            if sim.frame in presses:
+                immediate += sim.request_jump()
+            sim.step()
+        assert sim.jump_count > immediate  # buffered jumps happened
+        expected.append(sim.final_score)
+    results = run_batch_with([presses] * len(SEEDS), "request")
+    assert results["score"].tolist() == expected
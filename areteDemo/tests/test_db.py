@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+from arete import db
+
+
+class Boom(Exception):
+    pass
+
+
+def count_users():
+    return db.get_connection().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+
+def test_transaction_commits(database):
+    with db.transaction() as cursor:
+        cursor.execute("INSERT INTO users (email, password) VALUES ('a@x', 'x')")
+    assert count_users() == 1
+
+
+def test_transaction_rolls_back_on_exception(database):
+    with pytest.raises(Boom):
+        with db.transaction() as cursor:
+            cursor.execute("INSERT INTO users (email, password) VALUES ('a@x', 'x')")
+            raise Boom()
+    assert count_users() == 0
+    assert not db.get_connection().in_transaction
+
+
+def test_nested_transaction_joins_the_outer_one(database):
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.transaction() as outer:
+            outer.execute("INSERT INTO users (email, password) VALUES ('a@x', 'x')")
+            with db.transaction() as inner:
+                inner.execute("INSERT INTO users (email, password) VALUES ('a@x', 'x')")
+    assert count_users() == 0
+
+
+def test_connection_is_reused_per_thread(database):
+    assert db.get_connection() is db.get_connection()
+    assert db.get_connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
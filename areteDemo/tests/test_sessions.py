@@ -0,0 +1,52 @@
+# Remember-me tokens (auth.create_session / resume_session). No argon2 needed:
+# users are inserted directly.
+from arete import auth, db
+
+from conftest import add_user
+
+
+def tamper(token):
+    selector, verifier = token.split(".")
+    return f"{selector}.{'A' if verifier[0] != 'A' else 'B'}{verifier[1:]}"
+
+
+def test_resume_accepts_a_fresh_token(database):
+    user_id = add_user()
+    token = auth.create_session(user_id)
+    assert auth.resume_session(token) == (user_id,)
+
+
+def test_resume_rejects_a_revoked_token(database):
+    user_id = add_user()
+    token = auth.create_session(user_id)
+    auth.revoke_session(token)
+    assert auth.resume_session(token) is None
+
+
+def test_resume_rejects_a_tampered_token(database):
+    user_id = add_user()
+    token = auth.create_session(user_id)
+    assert auth.resume_session(tamper(token)) is None
+    selector, verifier = token.split(".")
+    assert auth.resume_session(f"other{selector}.{verifier}") is None
+    for junk in (None, "", "no-dot", ".", f"{selector}."):
+        assert auth.resume_session(junk) is None
+    # the real token still works
+    assert auth.resume_session(token) == (user_id,)
+
+
+def test_resume_rejects_an_expired_token(database):
+    user_id = add_user()
+    token = auth.create_session(user_id, ttl=-1)
+    assert auth.resume_session(token) is None
+    assert db.get_connection().execute("SELECT COUNT(*) FROM login_sessions").fetchone()[0] == 0
+
+
+def test_revoking_a_user_ends_all_their_sessions(database):
+    user_id = add_user()
+    other = add_user("other@example.com")
+    tokens = [auth.create_session(user_id) for _ in range(2)]
+    kept = auth.create_session(other)
+    auth.revoke_user_sessions(user_id)
+    assert [auth.resume_session(t) for t in tokens] == [None, None]
+    assert auth.resume_session(kept) == (other,)
@@ -0,0 +1,46 @@
+# Determinism of GameSimulation: the same seed and inputs play out the same session,
+# stepped by hand or through the headless runner. Run from the areteDemo folder:
+#   python -m pytest tests
+import pytest
+
+from game.headless import heuristic_policy, run_session
+from game.simulation import GameSimulation
+
+SEEDS = [0, 1, 12345, 2**32 - 1]
+DURATION = 30
+PRESSES = range(10, DURATION * 120, 37)  # a scripted SPACE press every 37 frames
+
+
+def play(seed, inputs=None):
+    # steps a session by hand; returns the per-frame trace and the end result
+    sim = GameSimulation(seed=seed, duration=DURATION)
+    inputs = set(inputs) if inputs is not None else None
+    trace = []
+    while not sim.game_over:
+        jump = sim.frame in inputs if inputs is not None else heuristic_policy(sim)
+        sim.step(jump=jump)
+        trace.append((sim.player_y, sim.speed, sim.score_distance, sim.avoided_count, sim.hit_count))
+    return trace, (sim.final_score, sim.avoided_count, sim.hit_count, sim.frame)
+
+
+def result(session):
+    return session["score"], session["avoided"], session["hits"], session["frames"]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_same_seed_plays_the_same_session(seed):
+    assert play(seed) == play(seed)
+    assert play(seed, PRESSES) == play(seed, PRESSES)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_headless_runner_matches_stepping_by_hand(seed):
+    _, by_hand = play(seed)
+    assert result(run_session(seed, duration=DURATION)) == by_hand
+    _, by_hand = play(seed, PRESSES)
+    assert result(run_session(seed, inputs=PRESSES, duration=DURATION)) == by_hand
+
+
+def test_seed_changes_the_session():
+    scores = {run_session(seed, inputs=PRESSES, duration=DURATION)["score"] for seed in SEEDS}
+    assert len(scores) > 1
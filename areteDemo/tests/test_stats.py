@@ -0,0 +1,35 @@
+import pytest
+
+from arete import db, stats
+
+from conftest import add_user
+
+
+def test_write_sessions_keeps_high_score_and_games_played(database):
+    alice = add_user("alice@example.com")
+    bob = add_user("bob@example.com")
+    stats.write_sessions([(alice, 500, 400, 1), (bob, 90, 80, 0), (alice, 300, 250, 0)])
+    stats.write_sessions([(alice, 800, 700, 1)])
+    assert stats.get_stats(alice) == (800, 3)
+    assert stats.get_stats(bob) == (90, 1)
+    assert [row[0] for row in stats.best_sessions(alice)] == [800, 500, 300]
+    assert [row[3] for row in stats.leaderboard()] == [800, 90]
+
+
+def test_failed_flush_keeps_the_games_for_the_next_one(database, monkeypatch):
+    alice = add_user()
+    recorder = stats.SessionRecorder()
+    recorder.record(alice, 100, 90, 0)
+
+    write_sessions = stats.write_sessions
+
+    def locked(rows):
+        raise db.sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(stats, "write_sessions", locked)
+    with pytest.raises(db.sqlite3.OperationalError):
+        recorder.flush().result()
+    recorder.record(alice, 200, 180, 1)
+
+    monkeypatch.setattr(stats, "write_sessions", write_sessions)
+    assert recorder.flush().result() == 2
+    assert stats.get_stats(alice) == (200, 2)